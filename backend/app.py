@@ -1,16 +1,47 @@
 from __future__ import annotations
 
+import io
 import os
+import csv
+import sys
+import tempfile
+import inspect as pyinspect
+import json
+import base64
+import mmap
+import fcntl
+import struct
+import threading
+import asyncio
+import contextlib
+import contextvars
+import operator
+import queue
+import random
+import logging
+import logging.handlers
+import time
 import datetime as dt
-from typing import List, Optional
+from collections import Counter, OrderedDict
+from typing import Callable, List, NamedTuple, Optional, Union
 
-from fastapi import FastAPI, HTTPException, Depends, Query
+from fastapi import FastAPI, HTTPException, Depends, Query, Request, Response, WebSocket
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, Field
+from fastapi.responses import StreamingResponse
+from fastapi.routing import APIRoute
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Histogram, generate_latest, multiprocess
+import orjson
+from pydantic import BaseModel, Field, TypeAdapter
 
 from sqlalchemy import (
-    Column, Integer, String, Date, Float, Text, Table, ForeignKey, create_engine, select, func, UniqueConstraint
+    Column, Integer, String, Date, Float, Text, Table, ForeignKey, create_engine, event, inspect, select, func, insert, update, delete, and_, true, tuple_, bindparam, type_coerce,
+    Index, UniqueConstraint
 )
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Connection, make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
 from sqlalchemy.orm import (
     DeclarativeBase, Mapped, mapped_column, relationship, Session, sessionmaker
 )
@@ -21,13 +52,73 @@ from enum import Enum
 # DB
 # --------------------------------------------------------------------
 DB_URL = os.getenv("DATABASE_URL", "sqlite:///app.db")
-engine = create_engine(
-    DB_URL,
-    echo=False,
-    future=True,
-    connect_args={"check_same_thread": False} if DB_URL.startswith("sqlite") else {},
+# DB_ASYNC=1 serves every route on an AsyncSession (aiosqlite, or asyncpg from
+# requirements-postgres.txt) instead of the threadpool
+DB_ASYNC = os.getenv("DB_ASYNC", "0") == "1"
+
+def async_db_url(url: str) -> str:
+    for sync_prefix, async_prefix in (
+        ("sqlite://", "sqlite+aiosqlite://"),
+        ("postgresql://", "postgresql+asyncpg://"),
+        ("postgres://", "postgresql+asyncpg://"),
+    ):
+        if url.startswith(sync_prefix):
+            return async_prefix + url[len(sync_prefix):]
+    return url
+
+# Each worker process (WEB_CONCURRENCY, read by both gunicorn and uvicorn) owns
+# its own pool; DB_MAX_CONNECTIONS is the budget split across them.
+WEB_CONCURRENCY = int(os.getenv("WEB_CONCURRENCY", "1"))
+DB_MAX_CONNECTIONS = int(os.getenv("DB_MAX_CONNECTIONS", "40"))
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", max(4, DB_MAX_CONNECTIONS // WEB_CONCURRENCY)))
+
+def is_memory_sqlite(url) -> bool:
+    url = make_url(url)
+    return url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:")
+
+# in-memory SQLite is one shared connection (each new one would be an empty DB), so no sizing
+if is_memory_sqlite(DB_URL):
+    POOL_ARGS = dict(poolclass=StaticPool)
+else:
+    POOL_ARGS = dict(pool_size=DB_POOL_SIZE, max_overflow=0, pool_timeout=30)
+
+# Connect-time pragmas for file-backed SQLite; SQLITE_TUNED=0 restores driver defaults
+SQLITE_TUNED = os.getenv("SQLITE_TUNED", "1") == "1"
+SQLITE_PRAGMAS = (
+    ("journal_mode", "WAL"),        # readers no longer block on the writer
+    ("synchronous", "NORMAL"),      # fsync at checkpoints only; safe under WAL
+    ("mmap_size", str(256 * 1024 * 1024)),
+    ("cache_size", str(-64 * 1024)),  # KiB when negative -> 64 MiB
+    ("busy_timeout", "5000"),
+    ("foreign_keys", "ON"),
 )
+
+if DB_ASYNC:
+    async_engine = create_async_engine(async_db_url(DB_URL), echo=False, **POOL_ARGS)
+    # sync facade: used for engine events and metadata, never for blocking IO
+    engine = async_engine.sync_engine
+else:
+    async_engine = None
+    engine = create_engine(
+        DB_URL,
+        echo=False,
+        future=True,
+        connect_args={"check_same_thread": False} if DB_URL.startswith("sqlite") else {},
+        **POOL_ARGS,
+    )
+
+if SQLITE_TUNED and engine.dialect.name == "sqlite" and not is_memory_sqlite(engine.url):
+    @event.listens_for(engine, "connect")
+    def _sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in SQLITE_PRAGMAS:
+            cursor.execute(f"PRAGMA {name}={value};")
+        cursor.close()
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False, future=True)
+# shares SessionLocal's class so session event hooks apply in both modes
+AsyncSessionLocal = async_sessionmaker(
+    async_engine, sync_session_class=SessionLocal.class_, autoflush=False, expire_on_commit=True,
+) if DB_ASYNC else None
 
 class Base(DeclarativeBase):
     pass
@@ -38,6 +129,9 @@ gig_gent = Table(
     Base.metadata,
     Column("gig_id", ForeignKey("gigs.id", ondelete="CASCADE"), primary_key=True),
     Column("gent_id", ForeignKey("gents.id", ondelete="CASCADE"), primary_key=True),
+    # copy of gigs.date, kept in step by every writer, so a gent's bookings per day are one index probe
+    Column("date", Date, nullable=True),
+    Index("ix_gig_gent_gent_date", "gent_id", "date"),
 )
 
 # Enum
@@ -59,7 +153,12 @@ class AvailabilityORM(Base):
     gent_id: Mapped[int]   = mapped_column(ForeignKey("gents.id", ondelete="CASCADE"), nullable=False)
     status: Mapped[str]    = mapped_column(String(20), nullable=False, default=AvailabilityStatus.no_reply.value)
 
-    __table_args__ = (UniqueConstraint("gig_id", "gent_id", name="uq_avail_gig_gent"),)
+    __table_args__ = (
+        UniqueConstraint("gig_id", "gent_id", name="uq_avail_gig_gent"),
+        # covering index for the matrix join: (gig, gent) -> status without touching the table
+        Index("ix_availability_gig_gent_status", "gig_id", "gent_id", "status"),
+        Index("ix_availability_gent_id", "gent_id"),
+    )
 
 # ORM models
 class GentORM(Base):
@@ -67,9 +166,11 @@ class GentORM(Base):
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     name: Mapped[str] = mapped_column(String(200), nullable=False)
     username: Mapped[Optional[str]] = mapped_column(String(100), nullable=True, unique=True)
+    # carried through CSV import/export; not part of the API schema
+    voicepart: Mapped[Optional[str]] = mapped_column(String(20), nullable=True)
 
     gigs: Mapped[List["GigORM"]] = relationship(
-        secondary=gig_gent, back_populates="gents", lazy="selectin"
+        secondary=gig_gent, back_populates="gents", lazy="raise", passive_deletes=True
     )
 
 class GigORM(Base):
@@ -81,23 +182,288 @@ class GigORM(Base):
     notes: Mapped[str]    = mapped_column(Text,  nullable=False, default="")
     # store enum as TEXT for SQLite portability
     phase: Mapped[str]    = mapped_column(String(20), nullable=False, default=Phase.planning.value)
+    # change-version stamped from sync_state on every write (see next_change_version)
+    version: Mapped[int]  = mapped_column(Integer, nullable=False, default=0, index=True)
 
     gents: Mapped[List[GentORM]] = relationship(
-        secondary=gig_gent, back_populates="gigs", lazy="selectin"
+        secondary=gig_gent, back_populates="gigs", lazy="raise", passive_deletes=True
     )
 
-def get_session():
-    with SessionLocal() as session:
+    __table_args__ = (
+        Index("ix_gigs_title_date", "title", "date"),
+        # windowed/paged list_gigs: (date, title, id) is the keyset order
+        Index("ix_gigs_phase_date_title_id", "phase", "date", "title", "id"),
+        Index("ix_gigs_date_title_id", "date", "title", "id"),
+    )
+
+# Delta sync: a single monotonic counter plus tombstones for deleted gigs
+class SyncStateORM(Base):
+    __tablename__ = "sync_state"
+    id: Mapped[int]      = mapped_column(Integer, primary_key=True)
+    version: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+class GigTombstoneORM(Base):
+    __tablename__ = "gig_tombstones"
+    gig_id: Mapped[int]  = mapped_column(Integer, primary_key=True)
+    version: Mapped[int] = mapped_column(Integer, nullable=False, index=True)
+
+# Per-gent, per-month totals over booked/completed gigs, maintained by apply_rollups
+class GentMonthORM(Base):
+    __tablename__ = "gent_month_stats"
+    gent_id: Mapped[int]     = mapped_column(ForeignKey("gents.id", ondelete="CASCADE"), primary_key=True)
+    month: Mapped[dt.date]   = mapped_column(Date, primary_key=True)  # first day of the month
+    gigs: Mapped[int]        = mapped_column(Integer, nullable=False, default=0)
+    fee_share: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)  # sum of fee / crew size
+
+# Cross-worker event log for EVENT_BUS=db (see TableChangeBus)
+class ChangeEventORM(Base):
+    __tablename__ = "change_events"
+    id: Mapped[int]      = mapped_column(Integer, primary_key=True, autoincrement=True)
+    payload: Mapped[str] = mapped_column(Text, nullable=False)
+
+async def get_async_session():
+    async with AsyncSessionLocal() as session:
         yield session
 
-def debug_dump(session: Session):
-    print("=== Current DB state ===")
-    for g in session.query(GentORM).all():
-        print(f"Gent {g.id}: {g.name} ({g.username})")
-    for gig in session.query(GigORM).all():
-        gent_names = ", ".join([gent.name for gent in gig.gents])
-        print(f"Gig {gig.id}: {gig.title} on {gig.date} fee={gig.fee} phase={gig.phase} gents=[{gent_names}]")
-    print("========================")
+def db_route(handler):
+    """Route handlers are written once against a sync Session (a keyword-only
+    `session: Session` parameter); this decides how that session is provided.
+
+    Sync mode opens and closes the session inside the handler's worker thread.
+    (A yield dependency holds its connection until teardown, and teardown needs a
+    threadpool slot of its own, which deadlocks once the pool is exhausted.)
+    Async mode swaps in an AsyncSession and runs the handler body via run_sync,
+    so requests wait on the DB driver rather than on the threadpool."""
+    sig = pyinspect.signature(handler)
+    if DB_ASYNC:
+        params = [
+            p.replace(annotation=AsyncSession, default=Depends(get_async_session)) if p.name == "session" else p
+            for p in sig.parameters.values()
+        ]
+
+        async def endpoint(session: AsyncSession, **kwargs):
+            out = await session.run_sync(lambda s: handler(session=s, **kwargs))
+            mark_handler_done()
+            return out
+    else:
+        params = [p for p in sig.parameters.values() if p.name != "session"]
+
+        def endpoint(**kwargs):
+            with SessionLocal() as s:
+                out = handler(session=s, **kwargs)
+            mark_handler_done()
+            return out
+
+    # no functools.wraps: FastAPI would unwrap to the sync def and threadpool it
+    endpoint.__name__ = handler.__name__
+    endpoint.__qualname__ = handler.__qualname__
+    endpoint.__doc__ = handler.__doc__
+    endpoint.__signature__ = sig.replace(parameters=params)
+    endpoint.sync_handler = handler  # for callers that bring their own Session
+    return endpoint
+
+# --------------------------------------------------------------------
+# Change log (opt-in): only rows touched by a commit, written off-thread
+# --------------------------------------------------------------------
+CHANGE_LOG_ENABLED = os.getenv("CHANGE_LOG", "0") == "1"
+CHANGE_LOG_SAMPLE_RATE = float(os.getenv("CHANGE_LOG_SAMPLE_RATE", "1.0"))
+
+# off-thread sink shared by the change log and the slow-request log
+_log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+_log_listener = logging.handlers.QueueListener(_log_queue, logging.StreamHandler(sys.stdout))
+
+change_log = logging.getLogger("giggle.changes")
+change_log.propagate = False
+change_log.addHandler(logging.handlers.QueueHandler(_log_queue))
+change_log.setLevel(logging.INFO)
+
+def _describe_change(op: str, obj) -> dict:
+    pk = inspect(obj).mapper.primary_key_from_instance(obj)
+    return {"op": op, "table": obj.__tablename__, "id": pk[0] if len(pk) == 1 else pk}
+
+@event.listens_for(SessionLocal, "after_flush")
+def _collect_changes(session: Session, flush_context) -> None:
+    if not CHANGE_LOG_ENABLED:
+        return
+    pending = session.info.setdefault("changes", [])
+    pending.extend(_describe_change("insert", o) for o in session.new)
+    pending.extend(_describe_change("update", o) for o in session.dirty if session.is_modified(o))
+    pending.extend(_describe_change("delete", o) for o in session.deleted)
+
+def stage_changes(session: Session, op: str, table: str, keys) -> None:
+    """Core DML (link rows, upserts, rollups) never passes through the flush, so
+    those writers report the rows they touched here. Composite keys are lists."""
+    if CHANGE_LOG_ENABLED:
+        session.info.setdefault("changes", []).extend({"op": op, "table": table, "id": k} for k in keys)
+
+@event.listens_for(SessionLocal, "after_commit")
+def _emit_changes(session: Session) -> None:
+    changes = session.info.pop("changes", None)
+    if not changes or random.random() >= CHANGE_LOG_SAMPLE_RATE:
+        return
+    change_log.info(json.dumps({"ts": dt.datetime.utcnow().isoformat(), "changes": changes}, default=str))
+
+@event.listens_for(SessionLocal, "after_rollback")
+def _drop_changes(session: Session) -> None:
+    session.info.pop("changes", None)
+
+# --------------------------------------------------------------------
+# Metrics: per-route latency, DB work and serialization time on /metrics
+# --------------------------------------------------------------------
+# Multi-worker deployments set PROMETHEUS_MULTIPROC_DIR (an empty dir, wiped
+# before the workers start); prometheus_client then keeps samples in per-pid
+# files there and /metrics aggregates them, whichever worker serves the scrape.
+METRICS_MULTIPROC = bool(os.getenv("PROMETHEUS_MULTIPROC_DIR"))
+SLOW_REQUEST_MS = float(os.getenv("SLOW_REQUEST_MS", "0"))  # 0 disables the slow-request log
+METRICS_SKIP = {"/metrics", "/stream/sse"}  # scrapes and long-lived streams would only skew the histograms
+
+REQUEST_LATENCY = Histogram(
+    "giggle_request_duration_seconds", "Time from request to last body byte",
+    ["method", "route", "status"],
+)
+REQUEST_QUERIES = Histogram(
+    "giggle_request_db_queries", "SQL statements executed per request", ["route"],
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 100),
+)
+REQUEST_DB_TIME = Histogram(
+    "giggle_request_db_seconds", "Total time spent in the DB driver per request", ["route"],
+    buckets=(.0005, .001, .0025, .005, .01, .025, .05, .1, .25, .5, 1, 2.5),
+)
+REQUEST_ROWS = Histogram(
+    "giggle_request_db_rows", "Rows loaded or written per request", ["route"],
+    buckets=(0, 1, 10, 100, 1000, 10000, 100000),
+)
+REQUEST_SERIALIZE = Histogram(
+    "giggle_request_serialize_seconds", "Time turning handler results into response bytes", ["route"],
+    buckets=(.0001, .0005, .001, .0025, .005, .01, .025, .05, .1, .25, 1),
+)
+
+slow_log = logging.getLogger("giggle.slow")
+slow_log.propagate = False
+slow_log.addHandler(logging.handlers.QueueHandler(_log_queue))
+slow_log.setLevel(logging.INFO)
+
+class RequestStats:
+    __slots__ = ("queries", "db_time", "rows", "serialize", "handler_done", "statements")
+
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+        self.rows = 0
+        self.serialize = 0.0
+        self.handler_done: Optional[float] = None
+        self.statements: Optional[list] = [] if SLOW_REQUEST_MS else None
+
+# one per request, set by MetricsMiddleware; worker threads and run_sync share
+# the object through the copied context
+_request_stats: "contextvars.ContextVar[Optional[RequestStats]]" = contextvars.ContextVar(
+    "request_stats", default=None
+)
+
+def mark_handler_done() -> None:
+    stats = _request_stats.get()
+    if stats is not None:
+        stats.handler_done = time.perf_counter()
+
+def count_rows(n: int) -> None:
+    # for Core selects; ORM loads are counted by the load hook below
+    stats = _request_stats.get()
+    if stats is not None:
+        stats.rows += n
+
+@contextlib.contextmanager
+def serialize_timer():
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        stats = _request_stats.get()
+        if stats is not None:
+            stats.serialize += time.perf_counter() - start
+
+@event.listens_for(engine, "before_cursor_execute")
+def _query_start(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+@event.listens_for(engine, "after_cursor_execute")
+def _query_end(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_start"].pop()
+    stats = _request_stats.get()
+    if stats is None:
+        return
+    stats.queries += 1
+    stats.db_time += elapsed
+    if cursor.rowcount > 0:  # DML; SELECT rowcount is -1 until fetched
+        stats.rows += cursor.rowcount
+    if stats.statements is not None:
+        stats.statements.append({"sql": statement, "ms": round(elapsed * 1000, 3)})
+
+@event.listens_for(engine, "handle_error")
+def _query_failed(exception_context):
+    starts = exception_context.connection.info.get("query_start") if exception_context.connection else None
+    if starts:
+        starts.pop()
+
+@event.listens_for(Base, "load", propagate=True)
+def _count_loaded(target, context):
+    count_rows(1)
+
+class MetricsRoute(APIRoute):
+    """Charges FastAPI's own response_model validation and encoding, which runs
+    after the endpoint returns, to serialization time."""
+
+    def get_route_handler(self):
+        handler = super().get_route_handler()
+
+        async def timed(request: Request) -> Response:
+            response = await handler(request)
+            stats = _request_stats.get()
+            if stats is not None and stats.handler_done is not None:
+                stats.serialize += time.perf_counter() - stats.handler_done
+            return response
+
+        return timed
+
+class MetricsMiddleware:
+    """Pure ASGI (no BaseHTTPMiddleware) so streaming bodies pass straight through."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in METRICS_SKIP:
+            await self.app(scope, receive, send)
+            return
+        stats = RequestStats()
+        token = _request_stats.set(stats)
+        status = 500
+        start = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _request_stats.reset(token)
+            elapsed = time.perf_counter() - start
+            # route templates, not raw paths, keep label cardinality bounded
+            route = getattr(scope.get("route"), "path", "unmatched")
+            REQUEST_LATENCY.labels(scope["method"], route, status).observe(elapsed)
+            REQUEST_QUERIES.labels(route).observe(stats.queries)
+            REQUEST_DB_TIME.labels(route).observe(stats.db_time)
+            REQUEST_ROWS.labels(route).observe(stats.rows)
+            REQUEST_SERIALIZE.labels(route).observe(stats.serialize)
+            if SLOW_REQUEST_MS and elapsed * 1000 >= SLOW_REQUEST_MS:
+                slow_log.info(json.dumps({
+                    "ts": dt.datetime.utcnow().isoformat(),
+                    "method": scope["method"], "path": scope["path"], "route": route, "status": status,
+                    "ms": round(elapsed * 1000, 3), "db_ms": round(stats.db_time * 1000, 3),
+                    "queries": stats.queries, "rows": stats.rows, "statements": stats.statements,
+                }))
 
 # --------------------------------------------------------------------
 # Schemas
@@ -132,6 +498,23 @@ class GigUpdate(BaseModel):
     phase: Optional[Phase] = None
     gent_ids: Optional[List[int]] = None
 
+class BulkKind(str, Enum):
+    gents = "gents"
+    gigs  = "gigs"
+
+class BulkFormat(str, Enum):
+    csv    = "csv"
+    ndjson = "ndjson"
+
+class ImportResult(BaseModel):
+    kind: BulkKind
+    rows: int
+
+class GigDelta(BaseModel):
+    cursor: str
+    changed: List[Gig] = Field(default_factory=list)
+    deleted: List[int] = Field(default_factory=list)
+
 class AvailabilityEntry(BaseModel):
     gent_id: int
     status: AvailabilityStatus
@@ -140,11 +523,34 @@ class AvailabilityUpdate(BaseModel):
     gent_id: int
     status: AvailabilityStatus
 
+class AvailabilityBatchItem(BaseModel):
+    gig_id: int
+    gent_id: int
+    status: AvailabilityStatus
+
+class AvailabilityMatrix(BaseModel):
+    # statuses[i][j] is the status of gent_ids[j] for gig_ids[i]
+    gent_ids: List[int] = Field(default_factory=list)
+    gig_ids: List[int] = Field(default_factory=list)
+    statuses: List[List[AvailabilityStatus]] = Field(default_factory=list)
+
+class GentMonthStats(BaseModel):
+    month: dt.date
+    gigs: int
+    fee_share: float
+
+class GentReport(BaseModel):
+    gent_id: int
+    name: str
+    gigs: int
+    fee_share: float
+    months: List[GentMonthStats] = Field(default_factory=list)
 
 # --------------------------------------------------------------------
 # App + CORS
 # --------------------------------------------------------------------
 app = FastAPI(title="Giggle API (SQLite)", version="0.3")
+app.router.route_class = MetricsRoute
 
 app.add_middleware(
     CORSMiddleware,
@@ -153,11 +559,14 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(MetricsMiddleware)
 
 # --------------------------------------------------------------------
 # Startup (tables + migration + seed)
 # --------------------------------------------------------------------
 def seed_once(session: Session):
+    # workers boot concurrently: hold the write lock across the check and the inserts
+    lock_for_write(session)
     if session.scalar(select(func.count(GentORM.id))) or 0 > 0:
         return
     a = GentORM(name="Alice Archer", username="alice")
@@ -167,35 +576,123 @@ def seed_once(session: Session):
     session.add_all([a, b, c, d])
     session.flush()
 
-    g1 = GigORM(title="Summer Gala",   date=dt.date(2025, 8, 24), fee=1200.0, notes="Black tie.",         phase=Phase.booked.value,    gents=[a, c])
-    g2 = GigORM(title="Park Festival", date=dt.date(2025, 9,  5), fee=800.0,  notes="Outdoor stage.",     phase=Phase.planning.value,  gents=[b, d])
-    g3 = GigORM(title="Private Party", date=dt.date(2025, 9, 12), fee=1500.0, notes="",                    phase=Phase.completed.value, gents=[a, b, d])
+    g1 = GigORM(title="Summer Gala",   date=dt.date(2025, 8, 24), fee=1200.0, notes="Black tie.",         phase=Phase.booked.value)
+    g2 = GigORM(title="Park Festival", date=dt.date(2025, 9,  5), fee=800.0,  notes="Outdoor stage.",     phase=Phase.planning.value)
+    g3 = GigORM(title="Private Party", date=dt.date(2025, 9, 12), fee=1500.0, notes="",                    phase=Phase.completed.value)
     session.add_all([g1, g2, g3])
+    session.flush()
+    for gig, crew in ((g1, [a, c]), (g2, [b, d]), (g3, [a, b, d])):
+        set_gig_gents(session, gig, [g.id for g in crew])
+    apply_rollups(session, [g1.id, g2.id, g3.id], +1)
     session.commit()
 
+def _add_column(conn: Connection, table: str, name: str, ddl: str) -> None:
+    cols = [r[1] for r in conn.exec_driver_sql(f"PRAGMA table_info({table});")]
+    if name not in cols:
+        conn.exec_driver_sql(f"ALTER TABLE {table} ADD COLUMN {name} {ddl};")
+
+def _ensure_sync_state(conn: Connection) -> None:
+    if conn.execute(select(SyncStateORM.id).where(SyncStateORM.id == 1)).first() is None:
+        start = conn.execute(select(func.max(GigORM.version))).scalar() or 0
+        conn.execute(insert(SyncStateORM.__table__).values(id=1, version=start))
+
+def _migration_1_baseline(conn: Connection) -> None:
+    # DBs from before versioning may lack any of these; each step is idempotent
+    Base.metadata.create_all(conn)
+    _add_column(conn, "gigs", "phase", "TEXT NOT NULL DEFAULT 'planning'")
+    _add_column(conn, "gigs", "version", "INTEGER NOT NULL DEFAULT 0")
+    conn.exec_driver_sql("CREATE INDEX IF NOT EXISTS ix_gigs_version ON gigs (version);")
+    conn.exec_driver_sql(
+        "CREATE INDEX IF NOT EXISTS ix_availability_gig_gent_status ON availability (gig_id, gent_id, status);"
+    )
+    conn.exec_driver_sql("CREATE INDEX IF NOT EXISTS ix_availability_gent_id ON availability (gent_id);")
+    _ensure_sync_state(conn)
+
+def _migration_2_bulk_import(conn: Connection) -> None:
+    _add_column(conn, "gents", "voicepart", "VARCHAR(20)")
+    # natural-key lookup for gig upserts during import
+    conn.exec_driver_sql("CREATE INDEX IF NOT EXISTS ix_gigs_title_date ON gigs (title, date);")
+
+def _migration_3_change_events(conn: Connection) -> None:
+    Base.metadata.create_all(conn, tables=[ChangeEventORM.__table__])
+
+def _migration_4_gig_windows(conn: Connection) -> None:
+    conn.exec_driver_sql(
+        "CREATE INDEX IF NOT EXISTS ix_gigs_phase_date_title_id ON gigs (phase, date, title, id);"
+    )
+    conn.exec_driver_sql("CREATE INDEX IF NOT EXISTS ix_gigs_date_title_id ON gigs (date, title, id);")
+
+def rebuild_gent_rollups(conn: Connection) -> None:
+    # SQLite-only full recompute (migrations, generated datasets); routes use apply_rollups
+    conn.execute(delete(GentMonthORM))
+    conn.exec_driver_sql(f"""
+        INSERT INTO gent_month_stats (gent_id, month, gigs, fee_share)
+        SELECT gg.gent_id, date(g.date, 'start of month'), count(*), sum(g.fee / c.crew)
+        FROM gig_gent gg
+        JOIN gigs g ON g.id = gg.gig_id
+        JOIN (SELECT gig_id, count(*) AS crew FROM gig_gent GROUP BY gig_id) c ON c.gig_id = gg.gig_id
+        WHERE g.phase != '{Phase.planning.value}'
+        GROUP BY gg.gent_id, date(g.date, 'start of month');
+    """)
+
+def _migration_5_bookings(conn: Connection) -> None:
+    _add_column(conn, "gig_gent", "date", "DATE")
+    conn.exec_driver_sql("UPDATE gig_gent SET date = (SELECT date FROM gigs WHERE gigs.id = gig_gent.gig_id);")
+    conn.exec_driver_sql("CREATE INDEX IF NOT EXISTS ix_gig_gent_gent_date ON gig_gent (gent_id, date);")
+    Base.metadata.create_all(conn, tables=[GentMonthORM.__table__])
+    rebuild_gent_rollups(conn)
+
+# Append only; position N is schema version N (tracked in PRAGMA user_version)
+MIGRATIONS = [
+    _migration_1_baseline,
+    _migration_2_bulk_import,
+    _migration_3_change_events,
+    _migration_4_gig_windows,
+    _migration_5_bookings,
+]
+
+def migrate(conn: Connection) -> None:
+    if conn.dialect.name != "sqlite":
+        Base.metadata.create_all(conn)
+        _ensure_sync_state(conn)
+        conn.commit()
+        return
+    # Fast path: every worker after the first sees an up-to-date schema and does no introspection
+    if conn.exec_driver_sql("PRAGMA user_version;").scalar() >= len(MIGRATIONS):
+        conn.rollback()
+        return
+    # Take the write lock first so concurrently booting workers apply each migration once
+    conn.rollback()
+    conn.exec_driver_sql("BEGIN IMMEDIATE;")
+    current = conn.exec_driver_sql("PRAGMA user_version;").scalar()
+    for version, step in enumerate(MIGRATIONS[current:], start=current + 1):
+        step(conn)
+        conn.exec_driver_sql(f"PRAGMA user_version = {version};")
+    conn.commit()
+
 @app.on_event("startup")
-def startup():
-    Base.metadata.create_all(engine)
-    # --- lightweight migrations for SQLite ---
-    if DB_URL.startswith("sqlite"):
-        with engine.begin() as conn:
-            # gigs.phase column (you already have this)
-            cols = [r[1] for r in conn.exec_driver_sql("PRAGMA table_info(gigs);")]
-            if "phase" not in cols:
-                conn.exec_driver_sql("ALTER TABLE gigs ADD COLUMN phase TEXT NOT NULL DEFAULT 'planning';")
-
-            # availability table (create if not exists)
-            conn.exec_driver_sql("""
-                CREATE TABLE IF NOT EXISTS availability (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    gig_id INTEGER NOT NULL REFERENCES gigs(id) ON DELETE CASCADE,
-                    gent_id INTEGER NOT NULL REFERENCES gents(id) ON DELETE CASCADE,
-                    status TEXT NOT NULL DEFAULT 'no_reply',
-                    CONSTRAINT uq_avail_gig_gent UNIQUE (gig_id, gent_id)
-                );
-            """)
-    with SessionLocal() as s:
-        seed_once(s)
+async def startup():
+    if CHANGE_LOG_ENABLED or SLOW_REQUEST_MS:
+        _log_listener.start()
+    if DB_ASYNC:
+        async with async_engine.connect() as conn:
+            await conn.run_sync(migrate)
+        async with AsyncSessionLocal() as s:
+            await s.run_sync(seed_once)
+    else:
+        with engine.connect() as conn:
+            migrate(conn)
+        with SessionLocal() as s:
+            seed_once(s)
+    await change_bus.start()
+
+@app.on_event("shutdown")
+async def shutdown():
+    await change_bus.stop()
+    if CHANGE_LOG_ENABLED or SLOW_REQUEST_MS:
+        _log_listener.stop()
+    if DB_ASYNC:
+        await async_engine.dispose()
 
 # --------------------------------------------------------------------
 # Helpers
@@ -209,7 +706,102 @@ def ensure_gent_ids_exist(session: Session, ids: List[int]) -> None:
     if missing:
         raise HTTPException(status_code=400, detail=f"Unknown gent ids: {missing}")
 
-def gig_to_schema(gig: GigORM) -> Gig:
+def load_gent_ids(session: Session, gig_ids=None) -> dict[int, List[int]]:
+    """gig_id -> assigned gent ids, read straight from gig_gent (no GentORM rows).
+    gig_ids may be a list or a select() of ids; None means every gig."""
+    q = select(gig_gent.c.gig_id, gig_gent.c.gent_id).order_by(gig_gent.c.gig_id, gig_gent.c.gent_id)
+    if gig_ids is not None:
+        q = q.where(gig_gent.c.gig_id.in_(gig_ids))
+    out: dict[int, List[int]] = {}
+    n = 0
+    for n, (gig_id, gent_id) in enumerate(session.execute(q), start=1):
+        out.setdefault(gig_id, []).append(gent_id)
+    count_rows(n)
+    return out
+
+def set_gig_gents(session: Session, gig: GigORM, gent_ids: List[int]) -> None:
+    removed = session.scalars(
+        gig_gent.delete().where(gig_gent.c.gig_id == gig.id).returning(gig_gent.c.gent_id)
+    ).all()
+    stage_changes(session, "delete", "gig_gent", ([gig.id, g] for g in removed))
+    if gent_ids:
+        session.execute(
+            gig_gent.insert(), [{"gig_id": gig.id, "gent_id": g, "date": gig.date} for g in sorted(set(gent_ids))]
+        )
+        stage_changes(session, "insert", "gig_gent", ([gig.id, g] for g in sorted(set(gent_ids))))
+
+def find_double_bookings(session: Session, bookings: List[tuple[int, int, dt.date]]) -> List[str]:
+    """bookings are (gig_id, gent_id, date) about to exist; returns one line per gent
+    that would then be on more than one gig that day (existing rows or within the batch)."""
+    if not bookings:
+        return []
+    on_day: dict[tuple, set] = {}
+    for gig_id, gent_id, day in bookings:
+        on_day.setdefault((gent_id, day), set()).add(gig_id)
+    existing = session.execute(
+        select(gig_gent.c.gent_id, gig_gent.c.date, gig_gent.c.gig_id)
+        .where(tuple_(gig_gent.c.gent_id, gig_gent.c.date).in_(list(on_day)))
+    )
+    for gent_id, day, gig_id in existing:
+        on_day[(gent_id, day)].add(gig_id)
+    return [
+        f"gent {gent_id} on {day.isoformat()} (gigs {', '.join(map(str, sorted(gigs)))})"
+        for (gent_id, day), gigs in sorted(on_day.items()) if len(gigs) > 1
+    ]
+
+def check_double_booking(session: Session, bookings: List[tuple[int, int, dt.date]], allow: bool) -> None:
+    if allow:
+        return
+    clashes = find_double_bookings(session, bookings)
+    if clashes:
+        raise HTTPException(
+            status_code=409,
+            detail=f"Double booking: {'; '.join(clashes)}. Pass allow_double_booking=true to book anyway",
+        )
+
+def apply_rollups(session: Session, gig_ids, sign: int) -> None:
+    """Add (sign=+1) or take out (sign=-1) these gigs' current contribution to
+    gent_month_stats. Writers call this with -1 before touching a gig's crew,
+    date, fee or phase and +1 after (see rollups_for), in the same transaction."""
+    rows = session.execute(
+        select(gig_gent.c.gent_id, GigORM.id, GigORM.date, GigORM.fee)
+        .join(GigORM, GigORM.id == gig_gent.c.gig_id)
+        .where(gig_gent.c.gig_id.in_(gig_ids), GigORM.phase != Phase.planning.value)
+    ).all()
+    if not rows:
+        return
+    crew = Counter(gig_id for _, gig_id, _, _ in rows)
+    deltas: dict[tuple, list] = {}
+    for gent_id, gig_id, day, fee in rows:
+        d = deltas.setdefault((gent_id, day.replace(day=1)), [0, 0.0])
+        d[0] += sign
+        d[1] += sign * fee / crew[gig_id]
+    t = GentMonthORM.__table__
+    stmt = dialect_insert(session, t)
+    session.execute(
+        stmt.on_conflict_do_update(
+            index_elements=["gent_id", "month"],
+            set_={"gigs": t.c.gigs + stmt.excluded.gigs, "fee_share": t.c.fee_share + stmt.excluded.fee_share},
+        ),
+        [{"gent_id": g, "month": m, "gigs": n, "fee_share": share} for (g, m), (n, share) in deltas.items()],
+    )
+    stage_changes(session, "upsert", t.name, ([g, m] for g, m in deltas))
+    if sign < 0:
+        # empty months go away rather than lingering as float dust
+        emptied = session.execute(
+            delete(t).where(t.c.gigs <= 0, t.c.gent_id.in_({g for g, _ in deltas})).returning(t.c.gent_id, t.c.month)
+        ).all()
+        stage_changes(session, "delete", t.name, ([g, m] for g, m in emptied))
+
+@contextlib.contextmanager
+def rollups_for(session: Session, gig_ids):
+    gig_ids = list(gig_ids)
+    apply_rollups(session, gig_ids, -1)
+    yield
+    session.flush()  # autoflush is off; the ORM-side date/fee/phase edits must be visible
+    apply_rollups(session, gig_ids, +1)
+
+def gig_to_schema(gig: GigORM, gent_ids: List[int]) -> Gig:
     return Gig(
         id=gig.id,
         title=gig.title,
@@ -217,70 +809,880 @@ def gig_to_schema(gig: GigORM) -> Gig:
         fee=gig.fee,
         notes=gig.notes,
         phase=Phase(gig.phase),
-        gent_ids=[g.id for g in gig.gents],
+        gent_ids=gent_ids,
     )
     
-def sync_assignment_with_availability(session: Session, gig: GigORM, gent_id: int, status: AvailabilityStatus):
-    gent = session.get(GentORM, gent_id)
-    if gent is None:
-        return
-    is_member = any(g.id == gent_id for g in gig.gents)
+def sync_assignment_with_availability(
+    session: Session, gig: GigORM, gent_id: int, status: AvailabilityStatus, allow_double_booking: bool = False
+) -> bool:
+    """Returns True if the gig's assignment list changed. The caller has checked the gent exists."""
+    link = (gig_gent.c.gig_id == gig.id) & (gig_gent.c.gent_id == gent_id)
+    is_member = session.scalar(select(gig_gent.c.gig_id).where(link)) is not None
     if status == AvailabilityStatus.assigned and not is_member:
-        gig.gents.append(gent)
+        check_double_booking(session, [(gig.id, gent_id, gig.date)], allow_double_booking)
+        with rollups_for(session, [gig.id]):
+            session.execute(gig_gent.insert().values(gig_id=gig.id, gent_id=gent_id, date=gig.date))
+        stage_changes(session, "insert", "gig_gent", [[gig.id, gent_id]])
+        return True
     if status != AvailabilityStatus.assigned and is_member:
-        gig.gents = [g for g in gig.gents if g.id != gent_id]
+        with rollups_for(session, [gig.id]):
+            session.execute(gig_gent.delete().where(link))
+        stage_changes(session, "delete", "gig_gent", [[gig.id, gent_id]])
+        return True
+    return False
+
+def dialect_insert(session: Session, table):
+    # insert() that supports on_conflict_* for the backends we run on
+    if session.get_bind().dialect.name == "postgresql":
+        return postgresql.insert(table)
+    return sqlite.insert(table)
+
+def check_actor(actor_role: str, actor_gent_id: Optional[int], gent_id: int, status: AvailabilityStatus) -> None:
+    if actor_role == "gent":
+        if actor_gent_id is None or actor_gent_id != gent_id:
+            raise HTTPException(status_code=403, detail="Gents can only update their own availability")
+        if status == AvailabilityStatus.assigned:
+            raise HTTPException(status_code=403, detail="Only managers can assign")
+
+def next_change_version(session: Session) -> int:
+    # UPDATE ... RETURNING takes the write lock, so concurrent writers get distinct versions
+    return session.execute(
+        update(SyncStateORM)
+        .where(SyncStateORM.id == 1)
+        .values(version=SyncStateORM.version + 1)
+        .returning(SyncStateORM.version)
+    ).scalar_one()
+
+def lock_for_write(session: Session) -> None:
+    """Take the write lock before reading state a writer will subtract or check
+    (crews for rollups, bookings for clashes). pysqlite's deferred BEGIN would
+    otherwise only lock at the first DML, letting two writers read the same crew.
+    A no-op UPDATE of the sync_state row: SQLite's write lock, a row lock elsewhere."""
+    session.execute(update(SyncStateORM).where(SyncStateORM.id == 1).values(version=SyncStateORM.version))
+
+def current_change_version(session: Session) -> int:
+    return session.scalar(select(SyncStateORM.version).where(SyncStateORM.id == 1)) or 0
+
+def parse_cursor(cursor: str) -> int:
+    try:
+        return int(cursor)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+class GigWindow(NamedTuple):
+    """Date/phase filter and keyset page for list_gigs; hashable, so it doubles as a cache key."""
+    start: Optional[dt.date] = None
+    end: Optional[dt.date] = None
+    phases: tuple = ()
+    limit: Optional[int] = None
+    after: Optional[tuple] = None
+
+def encode_page_cursor(day, title: str, gig_id: int) -> str:
+    # day is a date, or already ISO text when it comes from a fast-path row
+    raw = json.dumps([str(day), title, gig_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+def parse_page_cursor(cursor: str) -> tuple[dt.date, str, int]:
+    # opaque to clients: base64url of [date, title, id], the last row of the previous page
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        day, title, gig_id = json.loads(raw)
+        return dt.date.fromisoformat(day), str(title), int(gig_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid page cursor")
+
+def is_visible_to(gig: GigORM, gent_ids: List[int], gent_id: Optional[int]) -> bool:
+    # same rule as the gent view of list_gigs
+    if gent_id is None or gig.phase == Phase.planning.value:
+        return True
+    return gent_id in gent_ids
+
+
+async def run_db(fn):
+    """Run fn(session) off the event loop, for async routes that do their own IO."""
+    if DB_ASYNC:
+        async with AsyncSessionLocal() as s:
+            return await s.run_sync(fn)
+
+    def call():
+        with SessionLocal() as s:
+            return fn(s)
+    return await run_in_threadpool(call)
+
+# --------------------------------------------------------------------
+# Bulk import / export (database/*.csv format, or NDJSON)
+# --------------------------------------------------------------------
+BULK_CHUNK_ROWS = 5000
+BULK_CSV_DATE = "%d/%m/%Y"
+BULK_COLUMNS = {
+    BulkKind.gents: ["id", "name", "username", "voicepart"],
+    BulkKind.gigs:  ["id", "title", "date", "fee", "notes", "phase", "gent_usernames"],
+}
+
+def read_records(text: io.TextIOBase, fmt: BulkFormat):
+    if fmt == BulkFormat.csv:
+        yield from csv.DictReader(text)
+    else:
+        for line in text:
+            if line.strip():
+                record = json.loads(line)
+                if not isinstance(record, dict):
+                    raise ValueError(f"expected a JSON object per line, got {line.strip()[:80]!r}")
+                yield record
+
+def chunked(records, size: int = BULK_CHUNK_ROWS):
+    chunk = []
+    for r in records:
+        chunk.append(r)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def _blank_to_none(value):
+    return None if value is None or value == "" else value
+
+def parse_bulk_date(value) -> dt.date:
+    if isinstance(value, dt.date):
+        return value
+    try:
+        return dt.date.fromisoformat(value)
+    except ValueError:
+        pass
+    # DD/MM/YYYY; split() is ~10x faster than strptime at import volumes
+    try:
+        day, month, year = value.split("/")
+        return dt.date(int(year), int(month), int(day))
+    except ValueError:
+        raise ValueError(f"Bad date {value!r}, expected YYYY-MM-DD or DD/MM/YYYY")
+
+def parse_usernames(value) -> List[str]:
+    if isinstance(value, list):
+        return [u for u in value if u]
+    return [u.strip() for u in (value or "").split(";") if u.strip()]
+
+def parse_gent_chunk(chunk: List[dict], context=None) -> List[dict]:
+    return [
+        {"name": r["name"], "username": _blank_to_none(r.get("username")), "voicepart": _blank_to_none(r.get("voicepart"))}
+        for r in chunk
+    ]
+
+def write_gent_chunk(session: Session, rows: List[dict], options: ImportOptions) -> int:
+    """Upsert gents by username (rows without one are always inserted)."""
+    stmt = dialect_insert(session, GentORM.__table__)
+    bulk_execute(
+        session,
+        stmt.on_conflict_do_update(
+            index_elements=["username"],
+            set_={"name": stmt.excluded.name, "voicepart": stmt.excluded.voicepart},
+        ),
+        rows,
+    )
+    session.commit()
+    return len(rows)
+
+def bulk_execute(session: Session, stmt, rows: List[dict]) -> None:
+    """executemany; on SQLite, compile once and hand plain tuples to the driver,
+    skipping SQLAlchemy's per-row parameter processing (the bulk of import time)."""
+    if not rows:
+        return
+    conn = session.connection()
+    if conn.dialect.name != "sqlite":
+        session.execute(stmt, rows)
+        return
+    compiled = stmt.compile(dialect=conn.dialect, column_keys=list(rows[0]))
+    keys = compiled.positiontup
+    getter = operator.itemgetter(*keys) if len(keys) > 1 else (lambda r: (r[keys[0]],))
+    params = [getter(r) for r in rows]
+    # dates go in as ISO text, matching the Date type's SQLite storage format
+    date_cols = [i for i, k in enumerate(keys) if isinstance(rows[0][k], dt.date)]
+    if date_cols:
+        params = [
+            tuple(v.isoformat() if i in date_cols else v for i, v in enumerate(p)) for p in params
+        ]
+    cursor = conn.connection.dbapi_connection.cursor()
+    try:
+        cursor.executemany(str(compiled), params)
+    finally:
+        cursor.close()
+
+def gig_ids_by_key(session: Session, keys: List[tuple]) -> dict[tuple, int]:
+    """(title, date) -> gig id, one index probe per key."""
+    dates = [d for _, d in keys]
+    # history imports usually land in empty date ranges; skip the big IN lookup then
+    if not session.scalar(select(GigORM.id).where(GigORM.date.between(min(dates), max(dates))).limit(1)):
+        return {}
+    conn = session.connection()
+    if conn.dialect.name != "sqlite":
+        return {
+            (title, date): id_
+            for title, date, id_ in session.execute(
+                select(GigORM.title, GigORM.date, GigORM.id)
+                .where(tuple_(GigORM.title, GigORM.date).in_(keys))
+            )
+        }
+    # SQLite: a 5000-pair row-value IN costs more to expand and bind than the
+    # lookups themselves. Load the keys into a temp table instead and probe the
+    # index once per key (CROSS JOIN pins the temp table as the outer loop).
+    cursor = conn.connection.dbapi_connection.cursor()
+    try:
+        cursor.execute("CREATE TEMP TABLE IF NOT EXISTS import_keys (title TEXT NOT NULL, date TEXT NOT NULL);")
+        cursor.execute("DELETE FROM import_keys;")
+        cursor.executemany("INSERT INTO import_keys VALUES (?, ?);", [(t, d.isoformat()) for t, d in keys])
+        # DBAPI leaves execute()'s return value open (aiosqlite's adapter returns none)
+        cursor.execute(
+            "SELECT k.title, k.date, g.id FROM import_keys k CROSS JOIN gigs g"
+            " ON g.title = k.title AND g.date = k.date;"
+        )
+        found = cursor.fetchall()
+    finally:
+        cursor.close()
+    return {(title, dt.date.fromisoformat(date)): id_ for title, date, id_ in found}
+
+def insert_gigs(session: Session, rows: List[dict]) -> List[int]:
+    """Bulk insert, returning new ids in row order."""
+    if session.connection().dialect.name != "sqlite":
+        return session.scalars(
+            insert(GigORM).returning(GigORM.id, sort_by_parameter_order=True), rows
+        ).all()
+    # SQLite would run ordered RETURNING one row at a time. The import already holds
+    # the write lock (next_change_version), so ids past max(id) can be assigned here.
+    start = (session.scalar(select(func.max(GigORM.id))) or 0) + 1
+    ids = list(range(start, start + len(rows)))
+    bulk_execute(session, GigORM.__table__.insert(), [dict(r, id=i) for r, i in zip(rows, ids)])
+    return ids
+
+def gig_import_context(session: Session) -> dict[str, int]:
+    """username -> gent id, read once per import."""
+    return {
+        username: id_
+        for username, id_ in session.execute(
+            select(GentORM.username, GentORM.id).where(GentORM.username.is_not(None))
+        )
+    }
+
+def parse_gig_chunk(chunk: List[dict], gent_by_username: dict[str, int]) -> tuple[dict, dict]:
+    """Records -> gig rows by (title, date), plus the crew of every record with a
+    gent_usernames field. The last record wins for a key repeated in the chunk."""
+    rows: dict[tuple, dict] = {}
+    assignments: dict[tuple, List[int]] = {}
+    for r in chunk:
+        key = (r["title"], parse_bulk_date(r["date"]))
+        rows[key] = {
+            "title": key[0],
+            "date": key[1],
+            "fee": float(_blank_to_none(r.get("fee")) or 0.0),
+            "notes": r.get("notes") or "",
+            "phase": Phase(_blank_to_none(r.get("phase")) or Phase.planning.value).value,
+        }
+        if "gent_usernames" in r:
+            missing = [u for u in parse_usernames(r["gent_usernames"]) if u not in gent_by_username]
+            if missing:
+                raise ValueError(f"Unknown gent usernames {missing} on gig {key[0]!r} ({key[1]})")
+            assignments[key] = [gent_by_username[u] for u in parse_usernames(r["gent_usernames"])]
+    return rows, assignments
+
+def write_gig_chunk(session: Session, parsed: tuple[dict, dict], options: ImportOptions) -> int:
+    """Upsert gigs by (title, date). A crew replaces the gig's assignments and
+    marks those gents 'assigned'; every write is an executemany."""
+    rows, assignments = parsed
+    version = next_change_version(session)
+    for row in rows.values():
+        row["version"] = version
+    ids = gig_ids_by_key(session, list(rows))
+    # existing gigs leave the rollups here and every gig in the chunk re-enters below
+    apply_rollups(session, list(ids.values()), -1)
+    updates = [dict(rows[k], _id=ids[k]) for k in rows if k in ids]
+    inserts = [k for k in rows if k not in ids]
+    if updates:
+        t = GigORM.__table__
+        bulk_execute(
+            session,
+            t.update().where(t.c.id == bindparam("_id")).values(
+                {c: bindparam(c) for c in ("title", "date", "fee", "notes", "phase", "version")}
+            ),
+            updates,
+        )
+    if inserts:
+        ids.update(zip(inserts, insert_gigs(session, [rows[k] for k in inserts])))
+    stage_changes(session, "update", "gigs", (u["_id"] for u in updates))
+    stage_changes(session, "insert", "gigs", (ids[k] for k in inserts))
+    if updates:
+        # moved gigs keep their crew; carry the new date onto the link rows
+        bulk_execute(
+            session,
+            gig_gent.update().where(gig_gent.c.gig_id == bindparam("_id")).values(date=bindparam("date")),
+            [{"date": u["date"], "_id": u["_id"]} for u in updates],
+        )
+
+    if assignments:
+        gig_ids = [ids[k] for k in assignments]
+        removed = session.execute(
+            gig_gent.delete().where(gig_gent.c.gig_id.in_(gig_ids)).returning(gig_gent.c.gig_id, gig_gent.c.gent_id)
+        ).all()
+        stage_changes(session, "delete", "gig_gent", (list(k) for k in removed))
+        pairs = [
+            {"gig_id": ids[k], "gent_id": g, "date": k[1]} for k, gents in assignments.items() for g in set(gents)
+        ]
+        # the chunk's old crews are gone, so this sees other gigs' bookings and the chunk's own
+        check_double_booking(
+            session, [(p["gig_id"], p["gent_id"], p["date"]) for p in pairs], options.allow_double_booking
+        )
+        # gents dropped from a crew are no longer 'assigned' (as in sync_assignment_with_availability)
+        kept = {(p["gig_id"], p["gent_id"]) for p in pairs}
+        dropped = [{"_gig": g, "_gent": p} for g, p in removed if (g, p) not in kept]
+        if dropped:
+            t = AvailabilityORM.__table__
+            session.execute(
+                t.update().where(
+                    t.c.gig_id == bindparam("_gig"), t.c.gent_id == bindparam("_gent"),
+                    t.c.status == AvailabilityStatus.assigned.value,
+                ).values(status=AvailabilityStatus.no_reply.value),
+                dropped,
+            )
+            stage_changes(session, "update", "availability", ([d["_gig"], d["_gent"]] for d in dropped))
+        if pairs:
+            bulk_execute(session, gig_gent.insert(), pairs)
+            stmt = dialect_insert(session, AvailabilityORM.__table__)
+            bulk_execute(
+                session,
+                stmt.on_conflict_do_update(
+                    index_elements=["gig_id", "gent_id"],
+                    set_={"status": stmt.excluded.status},
+                ),
+                [{"gig_id": p["gig_id"], "gent_id": p["gent_id"], "status": AvailabilityStatus.assigned.value}
+                 for p in pairs],
+            )
+            stage_changes(session, "insert", "gig_gent", ([p["gig_id"], p["gent_id"]] for p in pairs))
+            stage_changes(session, "upsert", "availability", ([p["gig_id"], p["gent_id"]] for p in pairs))
+    apply_rollups(session, list(ids.values()), +1)
+    session.execute(delete(GigTombstoneORM).where(GigTombstoneORM.gig_id.in_(list(ids.values()))))
+    # too many rows to push individually; clients catch up via GET /gigs?since=
+    stage_event(session, {"type": "resync", "version": version})
+    session.commit()
+    return len(rows)
+
+class ImportOptions(NamedTuple):
+    allow_double_booking: bool = False  # gigs: book crews even where a gent already has a gig that day
+
+class BulkImporter(NamedTuple):
+    """An import runs context once, then parse and write per chunk. parse is pure
+    Python (no session), so the HTTP route runs it on a worker thread; write is
+    one transaction, so other writers get the write lock between chunks."""
+    context: Callable[[Session], object]
+    parse: Callable[[List[dict], object], object]
+    write: Callable[[Session, object, ImportOptions], int]
 
+IMPORTERS = {
+    BulkKind.gents: BulkImporter(lambda session: None, parse_gent_chunk, write_gent_chunk),
+    BulkKind.gigs:  BulkImporter(gig_import_context, parse_gig_chunk, write_gig_chunk),
+}
+
+def import_chunks(session: Session, kind: BulkKind, records, options: ImportOptions = ImportOptions()):
+    """Import records chunk by chunk, yielding the rows written so far after each
+    commit. A bad record stops the import; the chunks before it stay imported."""
+    importer = IMPORTERS[kind]
+    context = importer.context(session)
+    total = 0
+    for chunk in chunked(records):
+        total += importer.write(session, importer.parse(chunk, context), options)
+        yield total
+
+def export_page(session: Session, kind: BulkKind, after_id: int, limit: int = BULK_CHUNK_ROWS) -> List[dict]:
+    """One keyset page of export records, ordered by id."""
+    if kind == BulkKind.gents:
+        return [
+            {"id": id_, "name": name, "username": username, "voicepart": voicepart}
+            for id_, name, username, voicepart in session.execute(
+                select(GentORM.id, GentORM.name, GentORM.username, GentORM.voicepart)
+                .where(GentORM.id > after_id).order_by(GentORM.id).limit(limit)
+            )
+        ]
+    rows = session.execute(
+        select(GigORM.id, GigORM.title, GigORM.date, GigORM.fee, GigORM.notes, GigORM.phase)
+        .where(GigORM.id > after_id).order_by(GigORM.id).limit(limit)
+    ).all()
+    usernames: dict[int, List[str]] = {}
+    if rows:
+        for gig_id, username in session.execute(
+            select(gig_gent.c.gig_id, GentORM.username)
+            .join(GentORM, GentORM.id == gig_gent.c.gent_id)
+            .where(gig_gent.c.gig_id.between(rows[0].id, rows[-1].id), GentORM.username.is_not(None))
+            .order_by(gig_gent.c.gig_id, GentORM.username)
+        ):
+            usernames.setdefault(gig_id, []).append(username)
+    return [
+        {
+            "id": r.id, "title": r.title, "date": r.date, "fee": r.fee,
+            "notes": r.notes, "phase": r.phase, "gent_usernames": usernames.get(r.id, []),
+        }
+        for r in rows
+    ]
+
+def encode_records(kind: BulkKind, records: List[dict], fmt: BulkFormat, header: bool) -> str:
+    out = io.StringIO()
+    if fmt == BulkFormat.ndjson:
+        for r in records:
+            out.write(json.dumps(r, default=str))
+            out.write("\n")
+        return out.getvalue()
+    writer = csv.DictWriter(out, fieldnames=BULK_COLUMNS[kind], lineterminator="\n")
+    if header:
+        writer.writeheader()
+    for r in records:
+        if kind == BulkKind.gigs:
+            # repr round-trips the float exactly; whole fees keep the file's "800" style
+            r = dict(r, date=r["date"].strftime(BULK_CSV_DATE), fee=repr(r["fee"]).removesuffix(".0"),
+                     gent_usernames=";".join(r["gent_usernames"]))
+        writer.writerow(r)
+    return out.getvalue()
+
+def export_records(session: Session, kind: BulkKind, fmt: BulkFormat):
+    """Sync generator of encoded chunks (for the CLI)."""
+    after_id, first = 0, True
+    while page := export_page(session, kind, after_id):
+        yield encode_records(kind, page, fmt, header=first)
+        after_id, first = page[-1]["id"], False
+    if first and fmt == BulkFormat.csv:
+        yield encode_records(kind, [], fmt, header=True)
+
+# --------------------------------------------------------------------
+# Change events (pushed over /stream instead of clients re-polling)
+# --------------------------------------------------------------------
+# memory: this process only (single worker); db: change_events table, seen by every worker
+EVENT_BUS = os.getenv("EVENT_BUS", "db" if WEB_CONCURRENCY > 1 else "memory")
+EVENT_POLL_INTERVAL = float(os.getenv("EVENT_POLL_INTERVAL", "0.25"))
+EVENT_QUEUE_SIZE = 1000
+EVENT_RETENTION = 10000  # >= 1: the newest row must survive or SQLite reuses its id
+EVENT_PRUNE_EVERY = 1000  # polls
+SSE_KEEPALIVE = 15.0
+
+def stage_event(session: Session, event: dict) -> None:
+    """Queue an event to go out if (and only if) the session commits."""
+    session.info.setdefault("events", []).append(event)
+
+def gig_event(version: int, gig: Gig, prev: Optional[dict] = None) -> dict:
+    return {"type": "gig", "op": "upsert", "version": version, "gig": gig.model_dump(mode="json"), "prev": prev}
+
+def gig_state(phase: str, gent_ids: List[int]) -> dict:
+    return {"phase": phase, "gent_ids": gent_ids}
+
+def _state_visible(state: Optional[dict], gent_id: int) -> bool:
+    return state is not None and (state["phase"] == Phase.planning.value or gent_id in state["gent_ids"])
+
+def event_for_gent(event: dict, gent_id: Optional[int]) -> Optional[dict]:
+    """Apply list_gigs' visibility rule; a gig leaving a gent's view arrives as a delete."""
+    if gent_id is None or event["type"] == "resync":
+        return event
+    if event["type"] == "availability":
+        return event if event["gent_id"] == gent_id else None
+    if event["op"] == "delete":
+        return event if _state_visible(event["prev"], gent_id) else None
+    if _state_visible(event["gig"], gent_id):
+        return event
+    if _state_visible(event["prev"], gent_id):
+        return {"type": "gig", "op": "delete", "version": event["version"], "gig_id": event["gig"]["id"]}
+    return None
+
+class Subscriber:
+    def __init__(self):
+        self.queue: asyncio.Queue = asyncio.Queue(EVENT_QUEUE_SIZE)
+        self.lagged = False
+
+    def put(self, event: dict) -> None:
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.lagged = True
+
+    async def get(self) -> dict:
+        if self.lagged:
+            # a slow consumer gets one resync instead of a backlog; it re-reads via GET /gigs?since=
+            self.lagged = False
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            return {"type": "resync"}
+        return await self.queue.get()
+
+class LocalChangeBus:
+    """In-process fan-out: committed events go straight to this worker's subscribers."""
+
+    def __init__(self):
+        self.subscribers: set[Subscriber] = set()
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+
+    async def start(self) -> None:
+        self.loop = asyncio.get_running_loop()
+
+    async def stop(self) -> None:
+        pass
+
+    def before_commit(self, session: Session, events: List[dict]) -> None:
+        pass
+
+    def after_commit(self, events: List[dict]) -> None:
+        # commits happen on worker threads (or the loop, in async mode)
+        if self.loop is not None and self.subscribers:
+            self.loop.call_soon_threadsafe(self.dispatch, events)
+
+    def dispatch(self, events: List[dict]) -> None:
+        for sub in list(self.subscribers):
+            for e in events:
+                sub.put(e)
+
+    @contextlib.contextmanager
+    def subscribe(self):
+        sub = Subscriber()
+        self.subscribers.add(sub)
+        try:
+            yield sub
+        finally:
+            self.subscribers.discard(sub)
+
+class TableChangeBus(LocalChangeBus):
+    """Events are written to change_events in the committing transaction and every
+    worker polls for new rows, so all workers (and the bulk CLI) share one stream."""
+
+    def __init__(self):
+        super().__init__()
+        self.task: Optional[asyncio.Task] = None
+        self.last_id = 0
+
+    async def start(self) -> None:
+        await super().start()
+        self.last_id = await run_db(lambda s: s.scalar(select(func.max(ChangeEventORM.id))) or 0)
+        self.task = asyncio.create_task(self.poll())
+
+    async def stop(self) -> None:
+        if self.task is not None:
+            self.task.cancel()
+
+    def before_commit(self, session: Session, events: List[dict]) -> None:
+        # poll() trusts id order to be commit order. SQLite's single writer gives
+        # that for free; on Postgres concurrent transactions draw sequence values
+        # in any order, so hold the sync_state row lock (kept until commit) before
+        # drawing ids. A lower id can then never commit after a higher one.
+        lock_for_write(session)
+        session.execute(insert(ChangeEventORM), [{"payload": json.dumps(e)} for e in events])
+
+    def after_commit(self, events: List[dict]) -> None:
+        pass  # delivered by poll(), in commit order, on every worker
+
+    async def poll(self) -> None:
+        # Track the log continuously, subscribers or not: a subscriber that joins
+        # between two polls still gets every event committed after it joined.
+        polls = 0
+        while True:
+            await asyncio.sleep(EVENT_POLL_INTERVAL)
+            try:
+                rows = await run_db(lambda s: s.execute(
+                    select(ChangeEventORM.id, ChangeEventORM.payload)
+                    .where(ChangeEventORM.id > self.last_id)
+                    .order_by(ChangeEventORM.id)
+                    .limit(EVENT_QUEUE_SIZE)
+                ).all())
+                if rows:
+                    self.last_id = rows[-1][0]
+                    if self.subscribers:
+                        self.dispatch([json.loads(payload) for _, payload in rows])
+                polls += 1
+                # every write inserts a row, so pruning cannot wait for a subscriber
+                if polls % EVENT_PRUNE_EVERY == 0:
+                    await run_db(lambda s: _prune_events(s, self.last_id - EVENT_RETENTION))
+            except Exception:
+                logging.getLogger("giggle.events").exception("change event poll failed")
+
+def _prune_events(session: Session, below_id: int) -> None:
+    session.execute(delete(ChangeEventORM).where(ChangeEventORM.id <= below_id))
+    session.commit()
+
+change_bus = TableChangeBus() if EVENT_BUS == "db" else LocalChangeBus()
+
+@event.listens_for(SessionLocal, "before_commit")
+def _persist_events(session: Session) -> None:
+    events = session.info.get("events")
+    if events:
+        change_bus.before_commit(session, events)
+
+@event.listens_for(SessionLocal, "after_commit")
+def _publish_events(session: Session) -> None:
+    events = session.info.pop("events", None)
+    if events:
+        change_bus.after_commit(events)
+
+@event.listens_for(SessionLocal, "after_rollback")
+def _drop_events(session: Session) -> None:
+    session.info.pop("events", None)
+
+# --------------------------------------------------------------------
+# Response cache (pre-serialized list bodies, keyed by a global data version)
+# --------------------------------------------------------------------
+RESPONSE_CACHE_BYTES = int(float(os.getenv("RESPONSE_CACHE_MB", "32")) * 1024 * 1024)  # 0 disables
+RESPONSE_CACHE_TTL = float(os.getenv("RESPONSE_CACHE_TTL", "60"))
+
+def _default_version_path() -> str:
+    if engine.dialect.name == "sqlite" and not is_memory_sqlite(engine.url):
+        return engine.url.database + ".version"
+    return os.path.join(tempfile.gettempdir(), "giggle-data-version")
+
+DATA_VERSION_FILE = os.getenv("DATA_VERSION_FILE") or _default_version_path()
+
+class SharedVersion:
+    """A u64 counter in a memory-mapped file, shared by every worker on the host.
+    Reads are a plain memory load; bumps serialise on flock."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.fd: Optional[int] = None
+        self.mm: Optional[mmap.mmap] = None
+        self.lock = threading.Lock()
+
+    def _open(self) -> mmap.mmap:
+        with self.lock:
+            if self.mm is None:
+                fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+                if os.fstat(fd).st_size < 8:
+                    os.ftruncate(fd, 8)
+                self.fd, self.mm = fd, mmap.mmap(fd, 8)
+        return self.mm
+
+    def get(self) -> int:
+        return struct.unpack_from("Q", self.mm or self._open())[0]
+
+    def bump(self) -> int:
+        mm = self.mm or self._open()
+        fcntl.flock(self.fd, fcntl.LOCK_EX)
+        try:
+            value = struct.unpack_from("Q", mm)[0] + 1
+            struct.pack_into("Q", mm, 0, value)
+        finally:
+            fcntl.flock(self.fd, fcntl.LOCK_UN)
+        return value
+
+class ResponseCache:
+    """LRU of response bodies (plus any headers derived from them) with a TTL
+    and a total byte cap. Thread-safe."""
+
+    def __init__(self, max_bytes: int, ttl: float):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.entries: "OrderedDict[tuple, tuple[float, bytes, dict]]" = OrderedDict()
+        self.size = 0
+        self.lock = threading.Lock()
+
+    def get(self, key: tuple) -> Optional[tuple[bytes, dict]]:
+        with self.lock:
+            hit = self.entries.get(key)
+            if hit is None:
+                return None
+            if hit[0] < time.monotonic():
+                self._evict(key)
+                return None
+            self.entries.move_to_end(key)
+            return hit[1], hit[2]
+
+    def put(self, key: tuple, body: bytes, headers: Optional[dict] = None) -> None:
+        if len(body) > self.max_bytes:
+            return
+        with self.lock:
+            if key in self.entries:
+                self._evict(key)
+            self.entries[key] = (time.monotonic() + self.ttl, body, headers or {})
+            self.size += len(body)
+            while self.size > self.max_bytes:
+                self._evict(next(iter(self.entries)))
+
+    def clear(self) -> None:
+        with self.lock:
+            self.entries.clear()
+            self.size = 0
+
+    def _evict(self, key: tuple) -> None:
+        self.size -= len(self.entries.pop(key)[1])
+
+data_version = SharedVersion(DATA_VERSION_FILE)
+response_cache = ResponseCache(RESPONSE_CACHE_BYTES, RESPONSE_CACHE_TTL)
+
+@event.listens_for(SessionLocal, "after_commit")
+def _bump_data_version(session: Session) -> None:
+    # any commit may change a cached list; readers switch keys and never see the old body
+    if RESPONSE_CACHE_BYTES:
+        data_version.bump()
+
+# --------------------------------------------------------------------
+# Fast list serialization: column tuples straight to JSON bytes
+# --------------------------------------------------------------------
+# List routes skip ORM objects, pydantic models and response_model validation:
+# they select only the schema's columns and hand plain dicts to orjson. Keys are
+# emitted in schema field order and values in the types pydantic would produce,
+# so the bytes are identical to the response_model path (tests/test_serialize.py
+# checks this) and the decorators keep response_model for OpenAPI. That path is
+# pydantic's own JSON from FastAPI 0.135.1 on; older releases went through
+# json.dumps (1e-07 where both pydantic and orjson write 1e-7), hence the floor
+# in requirements.txt.
+
+# date as stored: ISO text on SQLite (no parse/format round trip), a date elsewhere
+GIG_COLUMNS = (GigORM.id, GigORM.title, type_coerce(GigORM.date, String), GigORM.fee, GigORM.notes, GigORM.phase)
+
+def json_response(content, headers: Optional[dict] = None) -> Response:
+    with serialize_timer():
+        body = orjson.dumps(content)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+# orjson before 3.11.7 writes 1e16 where pydantic writes 1e+16; only floats that large differ
+FLOAT_EXPONENT_FROM = 1e16
+GIG_LIST_ADAPTER = TypeAdapter(List[Gig])
+
+def encode_gigs(rows: list, gent_ids: dict[int, List[int]]) -> bytes:
+    gigs = [
+        {"id": id_, "title": title, "date": day, "fee": float(fee), "notes": notes, "phase": phase,
+         "gent_ids": gent_ids.get(id_, [])}
+        for id_, title, day, fee, notes, phase in rows
+    ]
+    if any(abs(g["fee"]) >= FLOAT_EXPONENT_FROM for g in gigs):
+        return GIG_LIST_ADAPTER.dump_json(GIG_LIST_ADAPTER.validate_python(gigs))
+    return orjson.dumps(gigs)
 
 # --------------------------------------------------------------------
 # Routes
 # --------------------------------------------------------------------
 
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    if METRICS_MULTIPROC:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return Response(content=generate_latest(registry), media_type=CONTENT_TYPE_LATEST)
+
 @app.get("/gents", response_model=List[Gent])
-def list_gents(session: Session = Depends(get_session)):
-    rows = session.scalars(select(GentORM).order_by(GentORM.name)).all()
-    return [Gent(id=r.id, name=r.name, username=r.username) for r in rows]
+@db_route
+def list_gents(*, session: Session):
+    rows = session.execute(select(GentORM.id, GentORM.name, GentORM.username).order_by(GentORM.name)).all()
+    count_rows(len(rows))
+    return json_response([{"id": id_, "name": name, "username": username} for id_, name, username in rows])
 
-@app.get("/gigs", response_model=List[Gig])
+@app.get("/gigs", response_model=Union[List[Gig], GigDelta])
+@db_route
 def list_gigs(
+    request: Request,
+    response: Response,
     gent_id: Optional[int] = Query(default=None),
-    session: Session = Depends(get_session),
+    since: Optional[str] = Query(default=None, description="Cursor from a previous response; returns only changes"),
+    from_: Optional[dt.date] = Query(default=None, alias="from", description="Only gigs on or after this date"),
+    to: Optional[dt.date] = Query(default=None, description="Only gigs on or before this date"),
+    phase: Optional[List[Phase]] = Query(default=None, description="Only gigs in these phases (repeatable)"),
+    limit: Optional[int] = Query(default=None, ge=1, le=1000, description="Page size; X-Next-Cursor is set while more remain"),
+    after: Optional[str] = Query(default=None, description="X-Next-Cursor from the previous page"),
+    *,
+    session: Session,
 ):
-    if gent_id is None:
-        # Manager view: all gigs
-        rows = session.scalars(
-            select(GigORM).order_by(GigORM.date, GigORM.title)
-        ).all()
-        return [gig_to_schema(g) for g in rows]
-
-    # Validate gent exists (even though planning gigs are public)
-    if not session.get(GentORM, gent_id):
+    # an unknown gent is a 404 even when the ETag still matches
+    if gent_id is not None and not session.get(GentORM, gent_id):
         raise HTTPException(status_code=404, detail="Gent not found")
+    # Cheap conditional GET: one scalar read, no gig rows loaded
+    version = current_change_version(session)
+    etag = f'W/"{version}"'
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag, "X-Sync-Cursor": str(version)})
+    response.headers["ETag"] = etag
+    response.headers["X-Sync-Cursor"] = str(version)
+
+    window = GigWindow(from_, to, tuple(sorted({p.value for p in phase or ()})),
+                       limit, parse_page_cursor(after) if after else None)
+    if since is not None:
+        if window != GigWindow():
+            raise HTTPException(status_code=400, detail="since cannot be combined with from/to/phase/limit/after")
+        since_version = parse_cursor(since)
+        changed = select(GigORM).where(GigORM.version > since_version)
+        rows = session.scalars(changed.order_by(GigORM.date, GigORM.title)).all()
+        gent_ids = load_gent_ids(session, changed.with_only_columns(GigORM.id))
+        delta = GigDelta(cursor=str(version))
+        for g in rows:
+            # a gig that left this gent's view is reported as deleted
+            if is_visible_to(g, gent_ids.get(g.id, []), gent_id):
+                delta.changed.append(gig_to_schema(g, gent_ids.get(g.id, [])))
+            else:
+                delta.deleted.append(g.id)
+        delta.deleted.extend(session.scalars(
+            select(GigTombstoneORM.gig_id).where(GigTombstoneORM.version > since_version)
+        ))
+        return delta
+
+    # read the version before the data: a commit landing in between only
+    # files fresher rows under the older key. The change version read above is
+    # part of the key too: data_version moves in after_commit, after the commit
+    # is visible, and until then the old body must not go out under the new ETag.
+    key = ("gigs", gent_id, window, version, data_version.get())
+    hit = response_cache.get(key) if RESPONSE_CACHE_BYTES else None
+    if hit is None:
+        rows, gent_ids = gig_list_rows(session, gent_id, window)
+        with serialize_timer():
+            hit = encode_gigs(rows, gent_ids), next_page_headers(rows, window)
+        if RESPONSE_CACHE_BYTES:
+            response_cache.put(key, *hit)
+    body, page_headers = hit
+    return Response(content=body, media_type="application/json",
+                    headers={"ETag": etag, "X-Sync-Cursor": str(version), **page_headers})
 
-    # Gent view:
-    #  - include ALL planning gigs
-    #  - include booked/completed gigs only if assigned
-    rows = session.scalars(
-        select(GigORM)
-        .outerjoin(gig_gent, gig_gent.c.gig_id == GigORM.id)
-        .where(
+def next_page_headers(rows: list, window: GigWindow) -> dict:
+    # a full page means there may be more; an exactly-full last page costs one empty fetch
+    if window.limit is not None and len(rows) == window.limit:
+        gig_id, title, day = rows[-1][:3]
+        return {"X-Next-Cursor": encode_page_cursor(day, title, gig_id)}
+    return {}
+
+def gig_list_rows(session: Session, gent_id: Optional[int], window: GigWindow) -> tuple[list, dict]:
+    visible = gig_list_query(session, gent_id, window, *GIG_COLUMNS)
+    rows = session.execute(visible).all()
+    count_rows(len(rows))
+    if window == GigWindow() and gent_id is None:
+        # Manager view of everything: one scan of gig_gent beats an IN over every id
+        gent_ids = load_gent_ids(session)
+    else:
+        gent_ids = load_gent_ids(session, visible.with_only_columns(GigORM.id))
+    return rows, gent_ids
+
+def gig_list_query(session: Session, gent_id: Optional[int], window: GigWindow, *columns):
+    """The list_gigs select (visibility, window, keyset order) over the given columns."""
+    visible = select(*columns)
+    if gent_id is not None:
+        # Gent view (list_gigs has already checked the gent exists):
+        #  - include ALL planning gigs
+        #  - include booked/completed gigs only if assigned
+        # (a semi-join instead of outer join + DISTINCT keeps the keyset order index-driven)
+        visible = visible.where(
             (GigORM.phase == Phase.planning.value) |
-            (gig_gent.c.gent_id == gent_id)
+            GigORM.id.in_(select(gig_gent.c.gig_id).where(gig_gent.c.gent_id == gent_id))
         )
-        .distinct()  # avoid dupes if multiple joins ever happen
-        .order_by(GigORM.date, GigORM.title)
-    ).all()
+    if window.start is not None:
+        visible = visible.where(GigORM.date >= window.start)
+    if window.end is not None:
+        visible = visible.where(GigORM.date <= window.end)
+    if window.phases:
+        visible = visible.where(GigORM.phase.in_(window.phases))
+    if window.after is not None:
+        visible = visible.where(tuple_(GigORM.date, GigORM.title, GigORM.id) > tuple_(*window.after))
+    return visible.order_by(GigORM.date, GigORM.title, GigORM.id).limit(window.limit)
 
-    return [gig_to_schema(g) for g in rows]
-    
 @app.get("/gigs/{gig_id}", response_model=Gig)
-def get_gig(gig_id: int, session: Session = Depends(get_session)):
+@db_route
+def get_gig(gig_id: int, *, session: Session):
     gig = session.get(GigORM, gig_id)
     if not gig:
         raise HTTPException(status_code=404, detail="Gig not found")
-    return gig_to_schema(gig)
+    return gig_to_schema(gig, load_gent_ids(session, [gig_id]).get(gig_id, []))
 
 @app.post("/gigs", response_model=Gig, status_code=201)
-def create_gig(payload: GigCreate, session: Session = Depends(get_session)):
+@db_route
+def create_gig(
+    payload: GigCreate,
+    allow_double_booking: bool = Query(default=False),
+    *,
+    session: Session,
+):
     ensure_gent_ids_exist(session, payload.gent_ids)
     gig = GigORM(
         title=payload.title,
@@ -288,79 +1690,134 @@ def create_gig(payload: GigCreate, session: Session = Depends(get_session)):
         fee=payload.fee,
         notes=payload.notes,
         phase=payload.phase.value,
+        version=next_change_version(session),
     )
-    if payload.gent_ids:
-        gig.gents = session.scalars(select(GentORM).where(GentORM.id.in_(payload.gent_ids))).all()
     session.add(gig)
+    session.flush()
+    check_double_booking(session, [(gig.id, g, gig.date) for g in set(payload.gent_ids)], allow_double_booking)
+    with rollups_for(session, [gig.id]):
+        set_gig_gents(session, gig, payload.gent_ids)
+    # SQLite may reuse the id of a deleted gig; drop its tombstone
+    session.execute(delete(GigTombstoneORM).where(GigTombstoneORM.gig_id == gig.id))
+    out = gig_to_schema(gig, sorted(set(payload.gent_ids)))
+    stage_event(session, gig_event(gig.version, out))
     session.commit()
-    session.refresh(gig)
-    debug_dump(session)
-    return gig_to_schema(gig)
+    return out
 
 @app.put("/gigs/{gig_id}", response_model=Gig)
-def update_gig(gig_id: int, patch: GigUpdate, session: Session = Depends(get_session)):
+@db_route
+def update_gig(
+    gig_id: int,
+    patch: GigUpdate,
+    allow_double_booking: bool = Query(default=False),
+    *,
+    session: Session,
+):
+    lock_for_write(session)
     gig = session.get(GigORM, gig_id)
     if not gig:
         raise HTTPException(status_code=404, detail="Gig not found")
-
-    if patch.title is not None: gig.title = patch.title
-    if patch.date  is not None: gig.date  = patch.date
-    if patch.fee   is not None: gig.fee   = patch.fee
-    if patch.notes is not None: gig.notes = patch.notes
-    if patch.phase is not None: gig.phase = patch.phase.value
+    prev = gig_state(gig.phase, load_gent_ids(session, [gig_id]).get(gig_id, []))
+    gent_ids = sorted(set(patch.gent_ids)) if patch.gent_ids is not None else prev["gent_ids"]
     if patch.gent_ids is not None:
         ensure_gent_ids_exist(session, patch.gent_ids)
-        gig.gents = session.scalars(select(GentORM).where(GentORM.id.in_(patch.gent_ids))).all()
+    # new crew members, or the whole crew when the gig moves to another day
+    day = patch.date if patch.date is not None else gig.date
+    joining = gent_ids if day != gig.date else set(gent_ids) - set(prev["gent_ids"])
+    check_double_booking(session, [(gig.id, g, day) for g in joining], allow_double_booking)
 
+    with rollups_for(session, [gig.id]):
+        if patch.title is not None: gig.title = patch.title
+        if patch.date  is not None: gig.date  = patch.date
+        if patch.fee   is not None: gig.fee   = patch.fee
+        if patch.notes is not None: gig.notes = patch.notes
+        if patch.phase is not None: gig.phase = patch.phase.value
+        if patch.gent_ids is not None:
+            set_gig_gents(session, gig, patch.gent_ids)
+        elif patch.date is not None:
+            session.execute(update(gig_gent).where(gig_gent.c.gig_id == gig.id).values(date=gig.date))
+            stage_changes(session, "update", "gig_gent", ([gig.id, g] for g in prev["gent_ids"]))
+    gig.version = next_change_version(session)
+
+    out = gig_to_schema(gig, gent_ids)
+    stage_event(session, gig_event(gig.version, out, prev))
     session.commit()
-    session.refresh(gig)
-    debug_dump(session)
-    return gig_to_schema(gig)
+    return out
 
 @app.get("/gigs/{gig_id}/availability", response_model=List[AvailabilityEntry])
-def get_availability(gig_id: int, session: Session = Depends(get_session)):
+@db_route
+def get_availability(gig_id: int, *, session: Session):
     gig = session.get(GigORM, gig_id)
     if not gig:
         raise HTTPException(status_code=404, detail="Gig not found")
 
-    # Build map gent_id -> status (default no_reply)
-    statuses = { (gid,): AvailabilityStatus.no_reply.value for (gid,) in session.execute(select(GentORM.id)) }
-
-    # Overlay existing availability rows for this gig
+    # All gents sorted by name, overlaid with this gig's rows (default no_reply)
     rows = session.execute(
-        select(AvailabilityORM.gent_id, AvailabilityORM.status).where(AvailabilityORM.gig_id == gig_id)
+        select(GentORM.id, func.coalesce(AvailabilityORM.status, AvailabilityStatus.no_reply.value))
+        .outerjoin(AvailabilityORM, and_(AvailabilityORM.gent_id == GentORM.id, AvailabilityORM.gig_id == gig_id))
+        .order_by(GentORM.name, GentORM.id)
     ).all()
-    for gid, st in rows:
-        statuses[(gid,)] = st
-
-    # Return entries for all gents, sorted by gent name
-    gent_rows = session.scalars(select(GentORM).order_by(GentORM.name)).all()
-    out: List[AvailabilityEntry] = []
-    for g in gent_rows:
-        out.append(AvailabilityEntry(gent_id=g.id, status=AvailabilityStatus(statuses[(g.id,)])))
+    count_rows(len(rows))
+    return json_response([{"gent_id": gid, "status": st} for gid, st in rows])
+
+@app.get("/availability", response_model=AvailabilityMatrix)
+@db_route
+def get_availability_matrix(
+    gig_ids: Optional[List[int]] = Query(default=None),
+    date_from: Optional[dt.date] = Query(default=None, alias="from"),
+    date_to: Optional[dt.date] = Query(default=None, alias="to"),
+    *,
+    session: Session,
+):
+    # unfiltered, this would be every gig x every gent in one response
+    if not gig_ids and date_from is None and date_to is None:
+        raise HTTPException(status_code=400, detail="Pass gig_ids, from or to to bound the matrix")
+
+    # One pass over gigs x gents, defaulting missing availability rows to no_reply
+    q = (
+        select(GigORM.id, GentORM.id, func.coalesce(AvailabilityORM.status, AvailabilityStatus.no_reply.value))
+        .select_from(GigORM)
+        .join(GentORM, true())
+        .outerjoin(AvailabilityORM, and_(AvailabilityORM.gig_id == GigORM.id, AvailabilityORM.gent_id == GentORM.id))
+        .order_by(GigORM.date, GigORM.title, GigORM.id, GentORM.name, GentORM.id)
+    )
+    if gig_ids:
+        q = q.where(GigORM.id.in_(gig_ids))
+    if date_from is not None:
+        q = q.where(GigORM.date >= date_from)
+    if date_to is not None:
+        q = q.where(GigORM.date <= date_to)
+
+    out = AvailabilityMatrix()
+    for gig_id, gent_id, status in session.execute(q):
+        if not out.gig_ids or out.gig_ids[-1] != gig_id:
+            out.gig_ids.append(gig_id)
+            out.statuses.append([])
+        if len(out.gig_ids) == 1:
+            out.gent_ids.append(gent_id)
+        out.statuses[-1].append(AvailabilityStatus(status))
     return out
 
 @app.put("/gigs/{gig_id}/availability", response_model=AvailabilityEntry)
+@db_route
 def set_availability(
     gig_id: int,
     payload: AvailabilityUpdate,
     actor_role: str = Query(..., pattern="^(manager|gent)$"),
     actor_gent_id: Optional[int] = Query(default=None),
-    session: Session = Depends(get_session),
+    allow_double_booking: bool = Query(default=False),
+    *,
+    session: Session,
 ):
+    lock_for_write(session)
     gig = session.get(GigORM, gig_id)
     if not gig:
         raise HTTPException(status_code=404, detail="Gig not found")
 
     # Validate actors / permissions
-    if actor_role == "gent":
-        if actor_gent_id is None or actor_gent_id != payload.gent_id:
-            raise HTTPException(status_code=403, detail="Gents can only update their own availability")
-        if payload.status == AvailabilityStatus.assigned:
-            raise HTTPException(status_code=403, detail="Only managers can assign")
-    else:
-        # manager: ok
-        pass
+    check_actor(actor_role, actor_gent_id, payload.gent_id, payload.status)
+    # up front: with foreign_keys=ON an unknown gent would otherwise fail at commit
+    ensure_gent_ids_exist(session, [payload.gent_id])
 
     # Upsert availability row
     avail = session.scalar(
@@ -376,24 +1833,233 @@ def set_availability(
         avail.status = payload.status.value
 
     # Keep assignment list in sync with 'assigned'
-    sync_assignment_with_availability(session, gig, payload.gent_id, payload.status)
+    if sync_assignment_with_availability(session, gig, payload.gent_id, payload.status, allow_double_booking):
+        gig.version = next_change_version(session)
+        gent_ids = load_gent_ids(session, [gig_id]).get(gig_id, [])
+        prev_ids = sorted(set(gent_ids) ^ {payload.gent_id})
+        stage_event(session, gig_event(gig.version, gig_to_schema(gig, gent_ids), gig_state(gig.phase, prev_ids)))
+    stage_event(session, {"type": "availability", "gig_id": gig_id, "gent_id": payload.gent_id, "status": payload.status.value})
 
     session.commit()
-    session.refresh(gig)  # in case membership changed
 
     return AvailabilityEntry(gent_id=payload.gent_id, status=payload.status)
 
+@app.put("/availability", response_model=List[AvailabilityBatchItem])
+@db_route
+def set_availability_batch(
+    payload: List[AvailabilityBatchItem],
+    actor_role: str = Query(..., pattern="^(manager|gent)$"),
+    actor_gent_id: Optional[int] = Query(default=None),
+    allow_double_booking: bool = Query(default=False),
+    *,
+    session: Session,
+):
+    # Last write wins for duplicate (gig, gent) pairs within one batch
+    items = {(i.gig_id, i.gent_id): i for i in payload}
+    if not items:
+        return []
+    for item in items.values():
+        check_actor(actor_role, actor_gent_id, item.gent_id, item.status)
+
+    lock_for_write(session)
+    gig_ids = {gig_id for gig_id, _ in items}
+    gig_dates = dict(session.execute(select(GigORM.id, GigORM.date).where(GigORM.id.in_(gig_ids))).all())
+    missing = sorted(gig_ids - set(gig_dates))
+    if missing:
+        raise HTTPException(status_code=404, detail=f"Unknown gig ids: {missing}")
+    ensure_gent_ids_exist(session, sorted({gent_id for _, gent_id in items}))
+
+    # Upsert all availability rows in one statement on uq_avail_gig_gent
+    stmt = dialect_insert(session, AvailabilityORM.__table__)
+    session.execute(
+        stmt.on_conflict_do_update(
+            index_elements=["gig_id", "gent_id"],
+            set_={"status": stmt.excluded.status},
+        ),
+        [{"gig_id": g, "gent_id": p, "status": i.status.value} for (g, p), i in items.items()],
+    )
+    stage_changes(session, "upsert", "availability", (list(k) for k in items))
+
+    # Keep gig_gent in sync with 'assigned' using set-based insert/delete
+    members = {(gig_id, gent_id) for gig_id, gent_id in session.execute(
+        select(gig_gent.c.gig_id, gig_gent.c.gent_id).where(
+            tuple_(gig_gent.c.gig_id, gig_gent.c.gent_id).in_(list(items))
+        )
+    )}
+    to_add = [k for k, i in items.items() if i.status == AvailabilityStatus.assigned and k not in members]
+    to_remove = [k for k, i in items.items() if i.status != AvailabilityStatus.assigned and k in members]
+    check_double_booking(session, [(g, p, gig_dates[g]) for g, p in to_add], allow_double_booking)
+    changed_gigs = {g for g, _ in to_add + to_remove}
+    with rollups_for(session, changed_gigs):
+        if to_add:
+            session.execute(gig_gent.insert(), [{"gig_id": g, "gent_id": p, "date": gig_dates[g]} for g, p in to_add])
+            stage_changes(session, "insert", "gig_gent", (list(k) for k in to_add))
+        if to_remove:
+            session.execute(
+                gig_gent.delete().where(tuple_(gig_gent.c.gig_id, gig_gent.c.gent_id).in_(to_remove))
+            )
+            stage_changes(session, "delete", "gig_gent", (list(k) for k in to_remove))
+    if changed_gigs:
+        version = next_change_version(session)
+        session.execute(update(GigORM).where(GigORM.id.in_(changed_gigs)).values(version=version))
+        stage_changes(session, "update", "gigs", sorted(changed_gigs))
+        gent_ids = load_gent_ids(session, list(changed_gigs))
+        for gig in session.scalars(select(GigORM).where(GigORM.id.in_(changed_gigs))):
+            now = gent_ids.get(gig.id, [])
+            prev = (set(now) - {p for g, p in to_add if g == gig.id}) | {p for g, p in to_remove if g == gig.id}
+            stage_event(session, gig_event(version, gig_to_schema(gig, now), gig_state(gig.phase, sorted(prev))))
+    for (g, p), i in items.items():
+        stage_event(session, {"type": "availability", "gig_id": g, "gent_id": p, "status": i.status.value})
+
+    session.commit()
+    return list(items.values())
+
 
 @app.delete("/gigs/{gig_id}", status_code=204)
+@db_route
 def delete_gig(
     gig_id: int,
     actor_role: Optional[str] = Query(default="manager"),
-    session: Session = Depends(get_session),
+    *,
+    session: Session,
 ):
+    lock_for_write(session)
     gig = session.get(GigORM, gig_id)
     if not gig:
         # Treat as success so the client can just refresh
         return Response(status_code=204)
+    prev = gig_state(gig.phase, load_gent_ids(session, [gig_id]).get(gig_id, []))
+    apply_rollups(session, [gig_id], -1)
+    # gig_gent is never loaded (passive_deletes), so clear link rows here
+    session.execute(gig_gent.delete().where(gig_gent.c.gig_id == gig_id))
+    stage_changes(session, "delete", "gig_gent", ([gig_id, g] for g in prev["gent_ids"]))
+    removed = session.scalars(
+        delete(AvailabilityORM).where(AvailabilityORM.gig_id == gig_id).returning(AvailabilityORM.id)
+    ).all()
+    stage_changes(session, "delete", "availability", removed)
     session.delete(gig)
+    version = next_change_version(session)
+    session.merge(GigTombstoneORM(gig_id=gig_id, version=version))
+    stage_event(session, {"type": "gig", "op": "delete", "version": version, "gig_id": gig_id, "prev": prev})
     session.commit()
     return Response(status_code=204)
+
+
+@app.get("/reports/gents", response_model=List[GentReport])
+@db_route
+def gent_report(
+    date_from: Optional[dt.date] = Query(default=None, alias="from", description="Months from this date's month"),
+    date_to: Optional[dt.date] = Query(default=None, alias="to", description="Months up to this date's month"),
+    *,
+    session: Session,
+):
+    """Booked/completed gigs and fee share (fee split evenly across the crew) per
+    gent, by month. Reads the maintained rollups, so cost scales with gents x months."""
+    q = select(GentMonthORM).order_by(GentMonthORM.gent_id, GentMonthORM.month)
+    if date_from is not None:
+        q = q.where(GentMonthORM.month >= date_from.replace(day=1))
+    if date_to is not None:
+        q = q.where(GentMonthORM.month <= date_to.replace(day=1))
+    months: dict[int, List[GentMonthStats]] = {}
+    for r in session.scalars(q):
+        months.setdefault(r.gent_id, []).append(
+            GentMonthStats(month=r.month, gigs=r.gigs, fee_share=round(r.fee_share, 2))
+        )
+    out = []
+    for gent in session.scalars(select(GentORM).order_by(GentORM.name)):
+        rows = months.get(gent.id, [])
+        out.append(GentReport(
+            gent_id=gent.id,
+            name=gent.name,
+            gigs=sum(m.gigs for m in rows),
+            fee_share=round(sum(m.fee_share for m in rows), 2),
+            months=rows,
+        ))
+    return out
+
+@app.post("/import/{kind}", response_model=ImportResult)
+async def import_data(
+    kind: BulkKind,
+    request: Request,
+    fmt: BulkFormat = Query(default=BulkFormat.csv, alias="format"),
+    allow_double_booking: bool = Query(default=False),
+):
+    # Spool the body (memory up to 8 MiB, then disk), then per chunk: parse on a worker
+    # thread (run_db would parse on the loop in async mode) and write in its own transaction
+    importer = IMPORTERS[kind]
+    options = ImportOptions(allow_double_booking=allow_double_booking)
+    with tempfile.SpooledTemporaryFile(max_size=8 * 1024 * 1024) as spool:
+        async for part in request.stream():
+            spool.write(part)
+        spool.seek(0)
+        chunks = chunked(read_records(io.TextIOWrapper(spool, encoding="utf-8-sig", newline=""), fmt))
+        context = await run_db(importer.context)
+        rows = 0
+        try:
+            while (parsed := await run_in_threadpool(parse_next_chunk, importer, chunks, context)) is not None:
+                rows += await run_db(lambda s: importer.write(s, parsed, options))
+        except (KeyError, ValueError, TypeError) as e:
+            raise HTTPException(
+                status_code=400, detail=f"Bad {kind.value} record: {e} ({rows} rows before it were imported)"
+            )
+        except HTTPException as e:
+            raise HTTPException(status_code=e.status_code, detail=f"{e.detail} ({rows} rows before it were imported)")
+    return ImportResult(kind=kind, rows=rows)
+
+def parse_next_chunk(importer: BulkImporter, chunks, context):
+    chunk = next(chunks, None)
+    return None if chunk is None else importer.parse(chunk, context)
+
+@app.get("/export/{kind}")
+async def export_data(kind: BulkKind, fmt: BulkFormat = Query(default=BulkFormat.csv, alias="format")):
+    async def body():
+        after_id, first = 0, True
+        # one short keyset query per chunk; memory stays at one page
+        while page := await run_db(lambda s: export_page(s, kind, after_id)):
+            yield encode_records(kind, page, fmt, header=first)
+            after_id, first = page[-1]["id"], False
+        if first and fmt == BulkFormat.csv:
+            yield encode_records(kind, [], fmt, header=True)
+
+    media_type = "text/csv" if fmt == BulkFormat.csv else "application/x-ndjson"
+    return StreamingResponse(body(), media_type=media_type)
+
+
+@app.websocket("/stream")
+async def stream_ws(websocket: WebSocket, gent_id: Optional[int] = None):
+    await websocket.accept()
+    with change_bus.subscribe() as sub:
+        async def until_disconnect():
+            while (await websocket.receive())["type"] != "websocket.disconnect":
+                pass
+
+        closed = asyncio.create_task(until_disconnect())
+        try:
+            while True:
+                nxt = asyncio.create_task(sub.get())
+                await asyncio.wait({nxt, closed}, return_when=asyncio.FIRST_COMPLETED)
+                if closed.done():
+                    nxt.cancel()
+                    return
+                event = event_for_gent(nxt.result(), gent_id)
+                if event is not None:
+                    await websocket.send_json(event)
+        finally:
+            closed.cancel()
+
+@app.get("/stream/sse")
+async def stream_sse(request: Request, gent_id: Optional[int] = Query(default=None)):
+    """Server-sent events fallback for clients that cannot hold a WebSocket."""
+    async def body():
+        with change_bus.subscribe() as sub:
+            while not await request.is_disconnected():
+                try:
+                    event = await asyncio.wait_for(sub.get(), SSE_KEEPALIVE)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                event = event_for_gent(event, gent_id)
+                if event is not None:
+                    yield f"data: {json.dumps(event)}\n\n"
+
+    return StreamingResponse(body(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
@@ -0,0 +1,352 @@
+"""
+End-to-end benchmark: realistic manager/gent traffic against a generated dataset.
+
+Generates (or reuses) a dataset with gen_data.py, then drives the app with
+concurrent clients either in-process (httpx over ASGI, no sockets; httpx comes
+from requirements-dev.txt) or through uvicorn. Reports throughput and
+p50/p95/p99 per endpoint and writes the run to JSON so runs can be compared later. Every target gets a fresh copy of the
+dataset, so write traffic in one run does not leak into the next.
+
+    python bench/bench_harness.py                                  # both targets, mixed traffic
+    python bench/bench_harness.py --target uvicorn --workers 2 --mix gent
+    python bench/bench_harness.py --gigs 50000 --out after.json --compare before.json
+
+Mixes: manager (office staff planning and booking), gent (phones syncing and
+replying), mixed (one manager client in five). Dataset dates and request
+windows are relative to --anchor-date rather than today, so runs on different
+days compare like with like.
+"""
+from __future__ import annotations
+
+import os
+import sys
+import json
+import time
+import shutil
+import random
+import asyncio
+import argparse
+import platform
+import importlib.util
+import sqlite3
+import tempfile
+import statistics
+import subprocess
+import datetime as dt
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+BACKEND = os.path.dirname(HERE)
+sys.path.insert(0, HERE)
+sys.path.insert(0, BACKEND)
+
+MIXES = ("manager", "gent", "mixed")
+
+
+# --------------------------------------------------------------------
+# Traffic
+# --------------------------------------------------------------------
+class Actor:
+    """One simulated device. Gents keep their sync cursor between polls like the app does."""
+
+    def __init__(self, rng: random.Random, role: str, n_gigs: int, n_gents: int, today: dt.date):
+        self.rng = rng
+        self.role = role
+        self.n_gigs = n_gigs
+        self.n_gents = n_gents
+        self.gent_id = rng.randint(1, n_gents)
+        self.cursor = "0"
+        self.today = today
+
+    def day(self, offset: int) -> str:
+        return (self.today + dt.timedelta(days=offset)).isoformat()
+
+    def gig(self) -> int:
+        return self.rng.randint(1, self.n_gigs)
+
+    def next_call(self) -> tuple[str, str, str, bytes]:
+        """(endpoint name, method, path, body)"""
+        return self.manager_call() if self.role == "manager" else self.gent_call()
+
+    def manager_call(self):
+        r = self.rng.random()
+        if r < 0.20:
+            return "GET /gigs window", "GET", f"/gigs?from={self.day(-7)}&to={self.day(90)}", b""
+        if r < 0.30:
+            return "GET /gigs planning page", "GET", "/gigs?phase=planning&limit=50", b""
+        if r < 0.45:
+            return "GET /availability matrix", "GET", f"/availability?from={self.day(0)}&to={self.day(30)}", b""
+        if r < 0.60:
+            return "GET /gigs/{id}", "GET", f"/gigs/{self.gig()}", b""
+        if r < 0.75:
+            return "GET /gigs/{id}/availability", "GET", f"/gigs/{self.gig()}/availability", b""
+        if r < 0.82:
+            return "GET /gents", "GET", "/gents", b""
+        if r < 0.90:
+            body = json.dumps({"notes": f"updated {self.rng.random():.6f}"}).encode()
+            return "PUT /gigs/{id}", "PUT", f"/gigs/{self.gig()}", body
+        if r < 0.97:
+            gig = self.gig()
+            items = [{"gig_id": gig, "gent_id": g, "status": self.rng.choice(["available", "assigned"])}
+                     for g in self.rng.sample(range(1, self.n_gents + 1), min(5, self.n_gents))]
+            return "PUT /availability batch", "PUT", "/availability?actor_role=manager", json.dumps(items).encode()
+        body = json.dumps({"title": f"Bench {self.rng.random():.6f}", "date": self.day(self.rng.randint(0, 365)),
+                           "gent_ids": []}).encode()
+        return "POST /gigs", "POST", "/gigs", body
+
+    def gent_call(self):
+        r = self.rng.random()
+        g = self.gent_id
+        if r < 0.30:
+            return "GET /gigs gent window", "GET", f"/gigs?gent_id={g}&from={self.day(0)}&to={self.day(60)}", b""
+        if r < 0.55:
+            return "GET /gigs gent since", "GET", f"/gigs?gent_id={g}&since={self.cursor}", b""
+        if r < 0.70:
+            return "GET /gigs/{id}", "GET", f"/gigs/{self.gig()}", b""
+        if r < 0.85:
+            return "GET /gigs/{id}/availability", "GET", f"/gigs/{self.gig()}/availability", b""
+        body = json.dumps({"gent_id": g, "status": self.rng.choice(["available", "unavailable"])}).encode()
+        return ("PUT /gigs/{id}/availability", "PUT",
+                f"/gigs/{self.gig()}/availability?actor_role=gent&actor_gent_id={g}", body)
+
+    def saw(self, headers: dict) -> None:
+        if "x-sync-cursor" in headers:
+            self.cursor = headers["x-sync-cursor"]
+
+
+def role_for(mix: str, client: int) -> str:
+    if mix == "mixed":
+        return "manager" if client % 5 == 0 else "gent"
+    return mix
+
+
+async def run_clients(send, args, n_gigs: int, n_gents: int) -> tuple[dict, float]:
+    samples: dict[str, list] = {}
+
+    async def client(i: int) -> None:
+        actor = Actor(random.Random(args.seed * 100_003 + i), role_for(args.mix, i), n_gigs, n_gents, args.anchor_date)
+        for _ in range(args.requests):
+            name, method, path, body = actor.next_call()
+            t0 = time.perf_counter()
+            status, headers = await send(i, method, path, body)
+            samples.setdefault(name, []).append((time.perf_counter() - t0, status))
+            actor.saw(headers)
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*(client(i) for i in range(args.clients)))
+    return samples, time.perf_counter() - t0
+
+
+# --------------------------------------------------------------------
+# Targets
+# --------------------------------------------------------------------
+async def run_inprocess(db_path: str, args, n_gigs: int, n_gents: int):
+    import httpx
+    import app
+
+    # the app binds DATABASE_URL at import; main() points it here before anything imports app
+    assert app.DB_URL == f"sqlite:///{db_path}", app.DB_URL
+
+    async with app.app.router.lifespan_context(app.app):
+        transport = httpx.ASGITransport(app=app.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as http:
+            async def send(i, method, path, body):
+                r = await http.request(method, path, content=body or None,
+                                       headers={"content-type": "application/json"} if body else None)
+                return r.status_code, r.headers
+            return await run_clients(send, args, n_gigs, n_gents)
+
+
+async def http_request(reader, writer, method: str, path: str, body: bytes) -> tuple[int, dict]:
+    head = f"{method} {path} HTTP/1.1\r\nHost: bench\r\nContent-Length: {len(body)}\r\n"
+    if body:
+        head += "Content-Type: application/json\r\n"
+    writer.write(head.encode() + b"\r\n" + body)
+    await writer.drain()
+    status_line = await reader.readline()
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b""):
+            break
+        name, _, value = line.decode().partition(":")
+        headers[name.strip().lower()] = value.strip()
+    length = int(headers.get("content-length", 0))
+    if length:
+        await reader.readexactly(length)
+    return int(status_line.split()[1]), headers
+
+
+def wait_for_port(port: int, timeout: float = 30.0) -> None:
+    import socket
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.2).close()
+            return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f"server on :{port} did not start")
+
+
+async def run_uvicorn(db_path: str, args, n_gigs: int, n_gents: int):
+    env = dict(os.environ, DATABASE_URL=f"sqlite:///{db_path}", WEB_CONCURRENCY=str(args.workers))
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app:app", "--port", str(args.port), "--log-level", "warning",
+         "--workers", str(args.workers), "--backlog", str(max(2048, args.clients * 2))],
+        cwd=BACKEND, env=env,
+    )
+    conns = {}
+    try:
+        wait_for_port(args.port)
+
+        async def send(i, method, path, body):
+            if i not in conns:
+                conns[i] = await asyncio.open_connection("127.0.0.1", args.port)
+            return await http_request(*conns[i], method, path, body)
+
+        return await run_clients(send, args, n_gigs, n_gents)
+    finally:
+        for _, writer in conns.values():
+            writer.close()
+        server.terminate()
+        server.wait()
+
+
+TARGETS = {"inprocess": run_inprocess, "uvicorn": run_uvicorn}
+
+
+# --------------------------------------------------------------------
+# Reporting
+# --------------------------------------------------------------------
+def summarize(samples: dict, elapsed: float) -> dict:
+    endpoints = {}
+    for name, rows in sorted(samples.items()):
+        lat = sorted(t for t, _ in rows)
+        q = statistics.quantiles(lat, n=100, method="inclusive") if len(lat) > 1 else [lat[0]] * 99
+        endpoints[name] = {
+            "count": len(rows),
+            # 4xx are expected outcomes (e.g. 409 double booking), 5xx are failures
+            "rejected": sum(1 for _, status in rows if 400 <= status < 500),
+            "errors": sum(1 for _, status in rows if status >= 500),
+            "rps": round(len(rows) / elapsed, 1),
+            "mean_ms": round(statistics.fmean(lat) * 1000, 3),
+            "p50_ms": round(q[49] * 1000, 3),
+            "p95_ms": round(q[94] * 1000, 3),
+            "p99_ms": round(q[98] * 1000, 3),
+        }
+    total = sum(e["count"] for e in endpoints.values())
+    return {"elapsed_s": round(elapsed, 3), "requests": total, "rps": round(total / elapsed, 1), "endpoints": endpoints}
+
+
+def print_run(target: str, result: dict) -> None:
+    print(f"\n{target}: {result['requests']} requests in {result['elapsed_s']:.1f}s = {result['rps']:.0f} req/s")
+    print(f"  {'endpoint':<30} {'count':>7} {'4xx':>5} {'5xx':>5} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for name, e in result["endpoints"].items():
+        print(f"  {name:<30} {e['count']:>7} {e['rejected']:>5} {e['errors']:>5} "
+              f"{e['p50_ms']:>9.2f} {e['p95_ms']:>9.2f} {e['p99_ms']:>9.2f}")
+
+
+def print_comparison(baseline: dict, current: dict) -> None:
+    print(f"\np95 vs {baseline['meta'].get('started', 'baseline')} (negative is faster)")
+    for key in ("anchor_date", "dataset"):
+        if baseline["meta"].get(key) != current["meta"].get(key):
+            print(f"  warning: {key} differs ({baseline['meta'].get(key)} vs {current['meta'].get(key)}); "
+                  "latencies are not like for like")
+    for target, result in current["runs"].items():
+        before = baseline["runs"].get(target)
+        if not before:
+            continue
+        print(f"  {target}: {before['rps']:.0f} -> {result['rps']:.0f} req/s")
+        for name, e in result["endpoints"].items():
+            old = before["endpoints"].get(name)
+            if old and old["p95_ms"]:
+                change = (e["p95_ms"] - old["p95_ms"]) / old["p95_ms"] * 100
+                print(f"    {name:<30} {old['p95_ms']:>9.2f} -> {e['p95_ms']:>9.2f} ms  {change:+6.1f}%")
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--target", choices=(*TARGETS, "both"), default="both")
+    parser.add_argument("--mix", choices=MIXES, default="mixed")
+    parser.add_argument("--clients", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=200, help="requests per client")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn workers")
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--db", help="reuse this generated dataset instead of building one")
+    parser.add_argument("--gents", type=int, default=60)
+    parser.add_argument("--gigs", type=int, default=10_000)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--anchor-date", type=dt.date.fromisoformat, default=None,
+                        help="the dataset's 'today' (default: gen_data.ANCHOR_DATE); match it when passing --db")
+    parser.add_argument("--out", help="results JSON (default: bench-<timestamp>.json)")
+    parser.add_argument("--compare", help="earlier results JSON to diff against")
+    args = parser.parse_args()
+    targets = list(TARGETS) if args.target == "both" else [args.target]
+    if "inprocess" in targets and importlib.util.find_spec("httpx") is None:
+        # httpx is a dev dependency (requirements-dev.txt), not a runtime one
+        if args.target == "inprocess":
+            parser.error("the inprocess target needs httpx: pip install -r requirements-dev.txt")
+        print("skipping the inprocess target: httpx is not installed (pip install -r requirements-dev.txt)")
+        targets.remove("inprocess")
+
+    workdir = tempfile.mkdtemp(prefix="giggle-bench-")
+    # must precede the first import of app (gen_data imports it too)
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(workdir, 'inprocess.db')}"
+    try:
+        import gen_data
+
+        if args.anchor_date is None:
+            args.anchor_date = gen_data.ANCHOR_DATE
+        source = args.db
+        if not source:
+            source = os.path.join(workdir, "dataset.db")
+            t0 = time.perf_counter()
+            counts = gen_data.generate(source, gents=args.gents, gigs=args.gigs, seed=args.seed, anchor=args.anchor_date)
+            print(f"dataset: {counts} in {time.perf_counter() - t0:.1f}s")
+        with sqlite3.connect(source) as conn:
+            n_gigs = conn.execute("SELECT max(id) FROM gigs").fetchone()[0]
+            n_gents = conn.execute("SELECT max(id) FROM gents").fetchone()[0]
+            dataset = {t: conn.execute(f"SELECT count(*) FROM {t}").fetchone()[0]
+                       for t in ("gents", "gigs", "gig_gent", "availability")}
+
+        report = {
+            "meta": {
+                "started": dt.datetime.now().isoformat(timespec="seconds"),
+                "git": git_revision(),
+                "python": platform.python_version(),
+                "sqlite": sqlite3.sqlite_version,
+                "machine": f"{platform.system()} {platform.machine()} x{os.cpu_count()}",
+                "anchor_date": args.anchor_date.isoformat(),
+                "args": {k: v for k, v in vars(args).items() if k not in ("out", "compare", "anchor_date")},
+                "dataset": dataset,
+            },
+            "runs": {},
+        }
+        for target in targets:
+            db_path = os.path.join(workdir, f"{target}.db")
+            shutil.copy(source, db_path)
+            samples, elapsed = asyncio.run(TARGETS[target](db_path, args, n_gigs, n_gents))
+            report["runs"][target] = summarize(samples, elapsed)
+            print_run(target, report["runs"][target])
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    out = args.out or f"bench-{dt.datetime.now():%Y%m%d-%H%M%S}.json"
+    with open(out, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nresults -> {out}")
+    if args.compare:
+        with open(args.compare) as f:
+            print_comparison(json.load(f), report)
+
+
+if __name__ == "__main__":
+    main()
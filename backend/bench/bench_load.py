@@ -0,0 +1,140 @@
+"""
+Concurrency load test: sync (threadpool) vs. DB_ASYNC=1 (AsyncSession) mode.
+
+Seeds a throwaway SQLite DB, starts uvicorn once per mode, and drives it with
+N concurrent keep-alive clients issuing a read-heavy mix of gig and
+availability requests. Prints p50/p99 latency and throughput per mode.
+
+    python bench/bench_load.py --clients 500 --requests 20
+"""
+from __future__ import annotations
+
+import os
+import sys
+import time
+import random
+import asyncio
+import argparse
+import tempfile
+import statistics
+import subprocess
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+BACKEND = os.path.dirname(HERE)
+sys.path.insert(0, BACKEND)
+
+from sqlalchemy import create_engine  # noqa: E402
+
+from bench_writes import seed  # noqa: E402
+
+
+async def http_request(reader, writer, method: str, path: str, body: bytes = b"") -> int:
+    head = f"{method} {path} HTTP/1.1\r\nHost: bench\r\nContent-Length: {len(body)}\r\n"
+    if body:
+        head += "Content-Type: application/json\r\n"
+    writer.write(head.encode() + b"\r\n" + body)
+    await writer.drain()
+    status_line = await reader.readline()
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b""):
+            break
+        name, _, value = line.decode().partition(":")
+        if name.lower() == "content-length":
+            length = int(value)
+    if length:
+        await reader.readexactly(length)
+    return int(status_line.split()[1])
+
+
+def next_call(rng: random.Random, n_gigs: int, n_gents: int):
+    gig = rng.randint(1, n_gigs)
+    gent = rng.randint(1, n_gents)
+    r = rng.random()
+    if r < 0.4:
+        return "GET", f"/gigs/{gig}", b""
+    if r < 0.7:
+        return "GET", f"/gigs/{gig}/availability", b""
+    if r < 0.9:
+        return "GET", f"/gigs?gent_id={gent}&since=0", b""
+    status = rng.choice(["available", "unavailable"])
+    return "PUT", f"/gigs/{gig}/availability?actor_role=manager", f'{{"gent_id": {gent}, "status": "{status}"}}'.encode()
+
+
+async def client(port: int, n_requests: int, seed_: int, n_gigs: int, n_gents: int, latencies, errors) -> None:
+    rng = random.Random(seed_)
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    try:
+        for _ in range(n_requests):
+            method, path, body = next_call(rng, n_gigs, n_gents)
+            t0 = time.perf_counter()
+            status = await http_request(reader, writer, method, path, body)
+            latencies.append(time.perf_counter() - t0)
+            if status >= 400:
+                errors.append(status)
+    finally:
+        writer.close()
+
+
+async def drive(port: int, clients: int, n_requests: int, n_gigs: int, n_gents: int):
+    latencies, errors = [], []
+    t0 = time.perf_counter()
+    await asyncio.gather(*(
+        client(port, n_requests, i, n_gigs, n_gents, latencies, errors) for i in range(clients)
+    ))
+    return latencies, errors, time.perf_counter() - t0
+
+
+def wait_for_port(port: int, timeout: float = 20.0) -> None:
+    import socket
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.2).close()
+            return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f"server on :{port} did not start")
+
+
+def run_mode(db_path: str, async_mode: bool, port: int, args) -> None:
+    env = dict(os.environ, DATABASE_URL=f"sqlite:///{db_path}", DB_ASYNC="1" if async_mode else "0")
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app:app", "--port", str(port), "--log-level", "warning",
+         "--backlog", str(max(2048, args.clients * 2))],
+        cwd=BACKEND, env=env,
+    )
+    try:
+        wait_for_port(port)
+        latencies, errors, elapsed = asyncio.run(drive(port, args.clients, args.requests, args.gigs, 20))
+    finally:
+        server.terminate()
+        server.wait()
+    q = statistics.quantiles(latencies, n=100)
+    print(f"{'async' if async_mode else 'sync':>6}  {q[49] * 1000:>8.1f}  {q[98] * 1000:>8.1f}  "
+          f"{len(latencies) / elapsed:>8.0f}  {len(errors):>6}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=500)
+    parser.add_argument("--requests", type=int, default=20, help="requests per client")
+    parser.add_argument("--gigs", type=int, default=1000)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    print(f"{'mode':>6}  {'p50 ms':>8}  {'p99 ms':>8}  {'req/s':>8}  {'errors':>6}")
+    for async_mode in (False, True):
+        path = tempfile.mktemp(suffix=".db")
+        engine = create_engine(f"sqlite:///{path}")
+        seed(engine, args.gigs)
+        engine.dispose()
+        try:
+            run_mode(path, async_mode, args.port, args)
+        finally:
+            os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
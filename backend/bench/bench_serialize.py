@@ -0,0 +1,73 @@
+"""
+List-route serialization: fast path (column tuples -> orjson) vs. the pydantic path.
+
+Builds a dataset with gen_data.py (10k gigs by default) and reports the p50
+latency of each list request, old vs new, in-process. "Old" is the reference
+handlers from tests/test_serialize.py (ORM rows -> pydantic models ->
+response_model), which that test also holds the new path to byte for byte.
+
+    python bench/bench_serialize.py
+    python bench/bench_serialize.py --gigs 50000 --repeats 10
+"""
+from __future__ import annotations
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+import statistics
+import datetime as dt
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+BACKEND = os.path.dirname(HERE)
+sys.path.insert(0, HERE)
+sys.path.insert(0, BACKEND)
+sys.path.insert(0, os.path.join(BACKEND, "tests"))
+
+WORKDIR = tempfile.mkdtemp(prefix="giggle-serialize-")
+DB_PATH = os.path.join(WORKDIR, "bench.db")
+# before the first import of app: fresh DB, sync sessions, and no response cache
+# (a cache hit would time nothing but a dict lookup)
+os.environ.update(DATABASE_URL=f"sqlite:///{DB_PATH}", DB_ASYNC="0", RESPONSE_CACHE_MB="0")
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+import app  # noqa: E402
+import gen_data  # noqa: E402
+from test_serialize import REFERENCE_ROUTES  # noqa: E402
+
+
+def p50_ms(client: TestClient, path: str, repeats: int) -> float:
+    client.get(path)  # warm caches and the connection pool
+    samples = []
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        client.get(path)
+        samples.append(time.perf_counter() - t0)
+    return statistics.median(samples) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--gigs", type=int, default=10_000)
+    parser.add_argument("--gents", type=int, default=60)
+    parser.add_argument("--repeats", type=int, default=20)
+    args = parser.parse_args()
+
+    counts = gen_data.generate(DB_PATH, gents=args.gents, gigs=args.gigs)
+    print(f"dataset: {counts}")
+    for path, handler, model in REFERENCE_ROUTES:
+        app.app.add_api_route(path, app.db_route(handler), response_model=model)
+    today = gen_data.ANCHOR_DATE
+    with TestClient(app.app) as client:
+        print(f"{'request':<42} {'old p50 ms':>11} {'new p50 ms':>11} {'speedup':>8}")
+        for path in ("/gigs", "/gigs?gent_id=1", f"/gigs?from={today}&to={today + dt.timedelta(days=90)}",
+                     "/gents", "/gigs/1/availability"):
+            before = p50_ms(client, "/reference" + path, args.repeats)
+            after = p50_ms(client, path, args.repeats)
+            print(f"{path:<42} {before:>11.2f} {after:>11.2f} {before / after:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
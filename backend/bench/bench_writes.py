@@ -0,0 +1,95 @@
+"""
+Write-path latency vs. table size.
+
+Seeds a throwaway SQLite DB with N gigs, then times create_gig / update_gig
+called directly (no HTTP). Latency should stay flat as N grows now that the
+write path no longer dumps the whole DB.
+
+    python bench/bench_writes.py                 # 100 .. 100k gigs
+    CHANGE_LOG=1 python bench/bench_writes.py    # with the change log on
+"""
+from __future__ import annotations
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+import statistics
+import datetime as dt
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, insert  # noqa: E402
+
+import app  # noqa: E402
+
+
+def seed(engine, n_gigs: int) -> None:
+    app.Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(insert(app.GentORM.__table__), [
+            {"name": f"Gent {i}", "username": f"gent{i}"} for i in range(1, 21)
+        ])
+        # version 1, as gen_data does: a since=0 delta then returns every seeded gig, not nothing
+        conn.execute(insert(app.SyncStateORM.__table__), [{"id": 1, "version": 1}])
+        start = dt.date(2020, 1, 1)
+        conn.execute(insert(app.GigORM.__table__), [
+            {
+                "title": f"Gig {i}",
+                "date": start + dt.timedelta(days=i % 3650),
+                "fee": 500.0,
+                "notes": "",
+                "phase": app.Phase.planning.value,
+                "version": 1,
+            }
+            for i in range(n_gigs)
+        ])
+
+
+def p50_ms(samples) -> float:
+    return statistics.median(samples) * 1000
+
+
+def run(n_gigs: int, repeats: int) -> tuple[float, float]:
+    path = tempfile.mktemp(suffix=".db")
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    try:
+        seed(engine, n_gigs)
+        creates, updates = [], []
+        # one day per gig, past the seeded range, so the double-booking check runs and passes
+        first_day = dt.date(2040, 1, 1)
+        for i in range(repeats):
+            day = first_day + dt.timedelta(days=i)
+            with app.SessionLocal(bind=engine) as s:
+                t0 = time.perf_counter()
+                gig = app.create_gig.sync_handler(
+                    app.GigCreate(title=f"Bench {i}", date=day, gent_ids=[1, 2]), allow_double_booking=False, session=s
+                )
+                creates.append(time.perf_counter() - t0)
+            with app.SessionLocal(bind=engine) as s:
+                t0 = time.perf_counter()
+                app.update_gig.sync_handler(
+                    gig.id, app.GigUpdate(notes="updated", gent_ids=[2, 3]), allow_double_booking=False, session=s
+                )
+                updates.append(time.perf_counter() - t0)
+        return p50_ms(creates), p50_ms(updates)
+    finally:
+        engine.dispose()
+        os.remove(path)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="100,1000,10000,100000")
+    parser.add_argument("--repeats", type=int, default=50)
+    args = parser.parse_args()
+
+    print(f"{'gigs':>8}  {'create p50 ms':>14}  {'update p50 ms':>14}")
+    for n in (int(x) for x in args.sizes.split(",")):
+        c, u = run(n, args.repeats)
+        print(f"{n:>8}  {c:>14.2f}  {u:>14.2f}")
+
+
+if __name__ == "__main__":
+    main()
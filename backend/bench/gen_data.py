@@ -0,0 +1,166 @@
+"""
+Seeded synthetic dataset at realistic scale.
+
+Builds a SQLite DB through the app's own migrations (so every index the app
+expects is present), then bulk-loads gents, gigs spread over past and future
+years, assignments for booked/completed gigs, and availability replies, then
+fills the per-gent monthly rollups.
+Dates are laid out around --anchor-date (not today), so the same --seed and
+--anchor-date always produce the same rows.
+
+    python bench/gen_data.py --db /tmp/giggle-bench.db --gents 200 --gigs 50000
+"""
+from __future__ import annotations
+
+import os
+import sys
+import time
+import random
+import argparse
+import datetime as dt
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, insert, update  # noqa: E402
+
+import app  # noqa: E402
+
+CHUNK_ROWS = 10_000
+ANCHOR_DATE = dt.date(2025, 9, 1)  # default "today" of generated data; fixed so runs stay comparable
+VOICEPARTS = ["tenor 1", "tenor 2", "baritone", "bass"]
+VENUES = ["Town Hall", "Cathedral", "Park", "Hotel", "Golf Club", "Museum", "Barn", "Castle", "Pier", "Gallery"]
+EVENTS = ["Wedding", "Gala", "Festival", "Carols", "Dinner", "Launch", "Reception", "Ball", "Memorial", "Concert"]
+
+
+def gig_rows(rng: random.Random, n_gigs: int, today: dt.date, years_back: int, years_ahead: int):
+    # gigs are spread over the whole window; the past is completed, the next
+    # couple of months mostly booked, and the far future still being planned
+    span = (years_back + years_ahead) * 365
+    first = today - dt.timedelta(days=years_back * 365)
+    for gig_id in range(1, n_gigs + 1):
+        day = first + dt.timedelta(days=rng.randrange(span))
+        if day < today:
+            phase = app.Phase.completed if rng.random() < 0.95 else app.Phase.booked
+        elif (day - today).days < 60:
+            phase = app.Phase.booked if rng.random() < 0.7 else app.Phase.planning
+        else:
+            phase = app.Phase.planning if rng.random() < 0.8 else app.Phase.booked
+        yield {
+            "id": gig_id,
+            "title": f"{rng.choice(VENUES)} {rng.choice(EVENTS)} {gig_id}",
+            "date": day,
+            "fee": float(rng.randrange(200, 3000, 50)),
+            "notes": "",
+            "phase": phase.value,
+            "version": 0,
+        }
+
+
+def insert_chunked(conn, table, rows) -> int:
+    n, chunk = 0, []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) == CHUNK_ROWS:
+            conn.execute(insert(table), chunk)
+            n, chunk = n + len(chunk), []
+    if chunk:
+        conn.execute(insert(table), chunk)
+        n += len(chunk)
+    return n
+
+
+def generate(
+    db_path: str,
+    gents: int = 60,
+    gigs: int = 10_000,
+    crew: tuple[int, int] = (4, 8),
+    reply_rate: float = 0.5,
+    years_back: int = 5,
+    years_ahead: int = 2,
+    seed: int = 1,
+    anchor: dt.date = ANCHOR_DATE,
+) -> dict:
+    """Create db_path (replacing it) and return the row counts written."""
+    for suffix in ("", "-wal", "-shm", ".version"):
+        if os.path.exists(db_path + suffix):
+            os.remove(db_path + suffix)
+    rng = random.Random(seed)
+    today = anchor
+    engine = create_engine(f"sqlite:///{db_path}")
+    counts = {}
+    try:
+        with engine.connect() as conn:
+            app.migrate(conn)
+        with engine.begin() as conn:
+            conn.exec_driver_sql("PRAGMA journal_mode=WAL;")
+            counts["gents"] = insert_chunked(conn, app.GentORM.__table__, (
+                {"id": i, "name": f"Gent {i}", "username": f"gent{i}", "voicepart": VOICEPARTS[i % len(VOICEPARTS)]}
+                for i in range(1, gents + 1)
+            ))
+            phases, dates = {}, {}
+            def remember(rows):
+                for row in rows:
+                    phases[row["id"]] = row["phase"]
+                    dates[row["id"]] = row["date"]
+                    yield row
+            counts["gigs"] = insert_chunked(conn, app.GigORM.__table__, remember(
+                gig_rows(rng, gigs, today, years_back, years_ahead)
+            ))
+
+            # Booked/completed gigs get a crew (gig_gent + availability 'assigned');
+            # everyone else has replied to a gig with probability reply_rate.
+            crews = {
+                gig_id: set(rng.sample(range(1, gents + 1), min(gents, rng.randint(*crew))))
+                for gig_id, phase in phases.items() if phase != app.Phase.planning.value
+            }
+            counts["assignments"] = insert_chunked(conn, app.gig_gent, (
+                {"gig_id": gig_id, "gent_id": gent_id, "date": dates[gig_id]}
+                for gig_id, members in crews.items() for gent_id in sorted(members)
+            ))
+            statuses = [app.AvailabilityStatus.available.value, app.AvailabilityStatus.unavailable.value,
+                        app.AvailabilityStatus.no_reply.value]
+
+            def availability():
+                for gig_id in range(1, gigs + 1):
+                    members = crews.get(gig_id, ())
+                    for gent_id in range(1, gents + 1):
+                        if gent_id in members:
+                            yield {"gig_id": gig_id, "gent_id": gent_id, "status": app.AvailabilityStatus.assigned.value}
+                        elif rng.random() < reply_rate:
+                            yield {"gig_id": gig_id, "gent_id": gent_id,
+                                   "status": rng.choices(statuses, weights=(6, 3, 1))[0]}
+            counts["availability"] = insert_chunked(conn, app.AvailabilityORM.__table__, availability())
+
+            conn.execute(update(app.GigORM.__table__).values(version=1))
+            conn.execute(update(app.SyncStateORM.__table__).where(app.SyncStateORM.id == 1).values(version=1))
+            app.rebuild_gent_rollups(conn)
+        with engine.connect() as conn:
+            conn.exec_driver_sql("ANALYZE;")
+    finally:
+        engine.dispose()
+    return counts
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--db", required=True)
+    parser.add_argument("--gents", type=int, default=60)
+    parser.add_argument("--gigs", type=int, default=10_000)
+    parser.add_argument("--crew", default="4,8", help="min,max gents assigned to each booked/completed gig")
+    parser.add_argument("--reply-rate", type=float, default=0.5, help="chance a gent has replied to a gig")
+    parser.add_argument("--years-back", type=int, default=5)
+    parser.add_argument("--years-ahead", type=int, default=2)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--anchor-date", type=dt.date.fromisoformat, default=ANCHOR_DATE,
+                        help="the dataset's 'today': past gigs are completed, future ones booked or planned")
+    args = parser.parse_args()
+
+    lo, hi = (int(x) for x in args.crew.split(","))
+    t0 = time.perf_counter()
+    counts = generate(args.db, args.gents, args.gigs, (lo, hi), args.reply_rate,
+                      args.years_back, args.years_ahead, args.seed, args.anchor_date)
+    print(", ".join(f"{k}={v}" for k, v in counts.items()), f"in {time.perf_counter() - t0:.1f}s -> {args.db}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Bulk import/export of gents and gigs from the command line.
+
+    python bulk.py import gents database/gents.csv
+    python bulk.py import gigs  database/gigs.csv
+    python bulk.py export gigs  -o gigs.ndjson
+    python bulk.py export gents              # CSV to stdout
+
+Uses DATABASE_URL like the app, always over a sync connection. Files ending
+in .ndjson / .jsonl are read and written as NDJSON, everything else as CSV
+(override with --format).
+"""
+from __future__ import annotations
+
+import sys
+import argparse
+
+from sqlalchemy import create_engine
+
+import app
+
+
+def guess_format(path: str | None, override: str | None) -> app.BulkFormat:
+    if override:
+        return app.BulkFormat(override)
+    if path and path.endswith((".ndjson", ".jsonl")):
+        return app.BulkFormat.ndjson
+    return app.BulkFormat.csv
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("action", choices=["import", "export"])
+    parser.add_argument("kind", choices=[k.value for k in app.BulkKind])
+    parser.add_argument("path", nargs="?", help="input file for import ('-' for stdin)")
+    parser.add_argument("-o", "--output", help="output file for export (default stdout)")
+    parser.add_argument("--format", choices=[f.value for f in app.BulkFormat])
+    parser.add_argument("--allow-double-booking", action="store_true",
+                        help="gigs: assign crews even where a gent already has a gig that day")
+    args = parser.parse_args(argv)
+    kind = app.BulkKind(args.kind)
+
+    # own sync engine: the app's may be an async facade when DB_ASYNC=1
+    engine = create_engine(app.DB_URL, connect_args={"check_same_thread": False} if app.DB_URL.startswith("sqlite") else {})
+    with engine.connect() as conn:
+        app.migrate(conn)
+
+    with app.SessionLocal(bind=engine) as session:
+        if args.action == "import":
+            if not args.path:
+                parser.error("import needs a path")
+            fmt = guess_format(args.path, args.format)
+            src = sys.stdin if args.path == "-" else open(args.path, encoding="utf-8-sig", newline="")
+            options = app.ImportOptions(allow_double_booking=args.allow_double_booking)
+            rows = 0
+            try:
+                # one transaction per chunk; rows is what has been committed so far
+                for rows in app.import_chunks(session, kind, app.read_records(src, fmt), options):
+                    pass
+            except (KeyError, ValueError, TypeError) as e:
+                print(f"import failed: bad {kind.value} record: {e} ({rows} rows before it were imported)",
+                      file=sys.stderr)
+                return 1
+            except app.HTTPException as e:
+                print(f"import failed: {e.detail} ({rows} rows before it were imported)", file=sys.stderr)
+                return 1
+            finally:
+                if src is not sys.stdin:
+                    src.close()
+            print(f"imported {rows} {kind.value}", file=sys.stderr)
+        else:
+            fmt = guess_format(args.output, args.format)
+            dst = open(args.output, "w", encoding="utf-8", newline="") if args.output else sys.stdout
+            try:
+                for chunk in app.export_records(session, kind, fmt):
+                    dst.write(chunk)
+            finally:
+                if dst is not sys.stdout:
+                    dst.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,38 @@
+import os
+import sys
+import tempfile
+
+import pytest
+
+# app binds DATABASE_URL at import: point it at a throwaway DB before anything imports app
+WORKDIR = tempfile.mkdtemp(prefix="giggle-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(WORKDIR, 'test.db')}"
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy import event  # noqa: E402
+
+import app  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def client():
+    # startup migrates and seeds the four gents and three gigs
+    with TestClient(app.app) as c:
+        yield c
+
+
+class QueryCounter:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        self.count += 1
+
+
+@pytest.fixture
+def queries():
+    counter = QueryCounter()
+    event.listen(app.engine, "before_cursor_execute", counter)
+    yield counter
+    event.remove(app.engine, "before_cursor_execute", counter)
@@ -0,0 +1,20 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+import app
+
+
+@pytest.mark.skipif(app.DB_ASYNC, reason="already running in async mode")
+def test_suite_passes_with_db_async():
+    # app picks its DB mode at import, so the async run needs its own process
+    tests = os.path.dirname(os.path.abspath(__file__))
+    env = {k: v for k, v in os.environ.items() if k != "DATABASE_URL"}
+    env["DB_ASYNC"] = "1"
+    result = subprocess.run(
+        [sys.executable, "-m", "pytest", "-q", "-p", "no:cacheprovider", tests],
+        env=env, cwd=os.path.dirname(tests), capture_output=True, text=True,
+    )
+    assert result.returncode == 0, result.stdout[-4000:] + result.stderr[-2000:]
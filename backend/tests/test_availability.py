@@ -0,0 +1,37 @@
+def test_unknown_gent_is_rejected(client):
+    r = client.put("/gigs/1/availability?actor_role=manager", json={"gent_id": 999, "status": "available"})
+    assert r.status_code == 400
+    assert "999" in r.json()["detail"]
+
+
+def test_matrix_needs_a_filter(client):
+    assert client.get("/availability").status_code == 400
+    r = client.get("/availability?gig_ids=1&gig_ids=2")
+    assert r.status_code == 200
+    assert r.json()["gig_ids"] == [1, 2]
+
+
+def test_matrix_columns_follow_gent_names_and_default_to_no_reply(client):
+    # a gent whose name sorts first but whose id is newest, so name order != id order
+    assert client.post("/import/gents", content="name,username\nAaron Abbott,aaron\n").status_code == 200
+    gents = client.get("/gents").json()
+    by_name = [g["id"] for g in gents]
+    aaron = next(g["id"] for g in gents if g["username"] == "aaron")
+    assert by_name[0] == aaron and by_name != sorted(by_name)
+
+    first = client.post("/gigs", json={"title": "Matrix first", "date": "2038-02-01"}).json()["id"]
+    second = client.post("/gigs", json={"title": "Matrix second", "date": "2038-02-02"}).json()["id"]
+    for gig, gent, status in ((first, 2, "unavailable"), (second, 3, "assigned")):
+        r = client.put(f"/gigs/{gig}/availability?actor_role=manager", json={"gent_id": gent, "status": status})
+        assert r.status_code == 200
+
+    matrix = client.get("/availability?from=2038-02-01&to=2038-02-02").json()
+    assert matrix["gig_ids"] == [first, second]
+    assert matrix["gent_ids"] == by_name
+    expected = {
+        first: {2: "unavailable"},
+        second: {3: "assigned"},
+    }
+    assert matrix["statuses"] == [
+        [expected[gig].get(gent, "no_reply") for gent in by_name] for gig in (first, second)
+    ]
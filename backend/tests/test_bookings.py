@@ -0,0 +1,57 @@
+import threading
+
+from sqlalchemy import select
+
+import app
+
+
+def run_concurrently(calls):
+    results = [None] * len(calls)
+
+    def run(i):
+        results[i] = calls[i]()
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(len(calls))]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return results
+
+
+def test_concurrent_assigns_cannot_double_book(client):
+    gig_ids = [client.post("/gigs", json={"title": f"Clash {i}", "date": "2032-05-01"}).json()["id"] for i in range(6)]
+    results = run_concurrently([
+        lambda g=g: client.put(f"/gigs/{g}/availability?actor_role=manager", json={"gent_id": 1, "status": "assigned"})
+        for g in gig_ids
+    ])
+    assert sorted(r.status_code for r in results) == [200] + [409] * 5
+
+
+def rollups(session, rebuild=False):
+    if rebuild:
+        # recompute from scratch; the session closes without committing it
+        app.rebuild_gent_rollups(session.connection())
+    return sorted((r.gent_id, r.month, r.gigs, round(r.fee_share, 6)) for r in session.scalars(select(app.GentMonthORM)))
+
+
+def test_concurrent_crew_changes_keep_rollups_exact(client):
+    gig_ids = [
+        client.post("/gigs", json={"title": f"Busy {i}", "date": f"2032-06-0{i + 1}", "fee": 1000,
+                                   "phase": "booked"}).json()["id"]
+        for i in range(2)
+    ]
+    crews = [[1], [1, 2], [2, 3, 4], [1, 2, 3, 4], [3]]
+    calls = []
+    for n in range(24):
+        g, crew = gig_ids[n % 2], crews[n % len(crews)]
+        if n % 3:
+            calls.append(lambda g=g, crew=crew: client.put(f"/gigs/{g}", json={"gent_ids": crew}))
+        else:
+            calls.append(lambda g=g, p=crew[0]: client.put(
+                "/availability?actor_role=manager", json=[{"gig_id": g, "gent_id": p, "status": "available"}]))
+    assert {r.status_code for r in run_concurrently(calls)} == {200}
+
+    maintained = client.portal.call(app.run_db, rollups)
+    rebuilt = client.portal.call(app.run_db, lambda s: rollups(s, rebuild=True))
+    assert maintained == rebuilt
@@ -0,0 +1,76 @@
+import csv
+import io
+
+import app
+
+
+def exported_gigs(client):
+    r = client.get("/export/gigs")
+    assert r.status_code == 200
+    return {row["title"]: row for row in csv.DictReader(io.StringIO(r.text))}
+
+
+def test_csv_export_keeps_fees_exact(client):
+    for title, fee in (("Fee cents", 12345.67), ("Fee large", 1234567.5)):
+        assert client.post("/gigs", json={"title": title, "date": "2031-03-01", "fee": fee}).status_code == 201
+    rows = exported_gigs(client)
+    assert rows["Fee cents"]["fee"] == "12345.67"
+    assert rows["Fee large"]["fee"] == "1234567.5"
+    assert rows["Park Festival"]["fee"] == "800"
+
+    # re-importing the export stores the same fee
+    body = "title,date,fee\nFee cents,01/03/2031," + rows["Fee cents"]["fee"] + "\n"
+    assert client.post("/import/gigs", content=body).status_code == 200
+    fees = {g["title"]: g["fee"] for g in client.get("/gigs?from=2031-03-01&to=2031-03-01").json()}
+    assert fees["Fee cents"] == 12345.67
+
+
+def test_import_crew_replacement_unassigns_dropped_gents(client):
+    assert client.post("/gigs", json={"title": "Crew swap", "date": "2031-04-01", "gent_ids": []}).status_code == 201
+    assert client.post("/import/gigs", content="title,date,gent_usernames\nCrew swap,01/04/2031,alice;bobby\n").status_code == 200
+    assert client.post("/import/gigs", content="title,date,gent_usernames\nCrew swap,01/04/2031,bobby\n").status_code == 200
+
+    gig = client.get("/gigs?from=2031-04-01&to=2031-04-01").json()[0]
+    assert gig["gent_ids"] == [2]
+    status = {a["gent_id"]: a["status"] for a in client.get(f"/gigs/{gig['id']}/availability").json()}
+    assert status[1] == "no_reply"
+    assert status[2] == "assigned"
+
+
+def test_import_rejects_non_object_ndjson_lines(client):
+    r = client.post("/import/gigs?format=ndjson", content='{"title": "Nd ok", "date": "2031-05-01"}\n[1, 2]\n')
+    assert r.status_code == 400
+    assert "JSON object" in r.json()["detail"]
+
+
+def test_import_counts_rows_written_not_records(client):
+    body = "title,date,fee\nDup key,01/06/2031,1\nDup key,01/06/2031,2\nOther key,01/06/2031,3\n"
+    r = client.post("/import/gigs", content=body)
+    assert r.json() == {"kind": "gigs", "rows": 2}
+    fees = {g["title"]: g["fee"] for g in client.get("/gigs?from=2031-06-01&to=2031-06-01").json()}
+    assert fees == {"Dup key": 2.0, "Other key": 3.0}
+
+
+def test_import_commits_chunk_by_chunk(client):
+    # the first chunk commits on its own; a bad record in the second leaves it imported
+    good = "".join(f"Chunked {i},02/07/2031\n" for i in range(app.BULK_CHUNK_ROWS))
+    r = client.post("/import/gigs", content="title,date\n" + good + "Chunked bad,not a date\n")
+    assert r.status_code == 400
+    assert f"({app.BULK_CHUNK_ROWS} rows before it were imported)" in r.json()["detail"]
+    assert len(client.get("/gigs?from=2031-07-02&to=2031-07-02").json()) == app.BULK_CHUNK_ROWS
+
+
+def test_import_rejects_double_bookings_unless_allowed(client):
+    assert client.post("/gigs", json={"title": "Booked first", "date": "2031-08-01", "gent_ids": [1]}).status_code == 201
+    clash = "title,date,gent_usernames\nBooked second,01/08/2031,alice\n"
+    r = client.post("/import/gigs", content=clash)
+    assert r.status_code == 409
+    assert "gent 1 on 2031-08-01" in r.json()["detail"]
+    # within one file too
+    same_file = "title,date,gent_usernames\nTwin a,02/08/2031,bobby\nTwin b,02/08/2031,bobby\n"
+    assert client.post("/import/gigs", content=same_file).status_code == 409
+    assert client.get("/gigs?from=2031-08-02&to=2031-08-02").json() == []
+
+    assert client.post("/import/gigs?allow_double_booking=true", content=clash).status_code == 200
+    crews = {g["title"]: g["gent_ids"] for g in client.get("/gigs?from=2031-08-01&to=2031-08-01").json()}
+    assert crews == {"Booked first": [1], "Booked second": [1]}
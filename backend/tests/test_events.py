@@ -0,0 +1,56 @@
+import asyncio
+
+from sqlalchemy import event, func, select
+
+import app
+
+
+def commit_event(session, n: int) -> None:
+    app.stage_event(session, {"type": "resync", "version": n})
+    session.commit()
+
+
+def test_table_bus_prunes_and_delivers_without_gaps(client, monkeypatch):
+    monkeypatch.setattr(app, "EVENT_POLL_INTERVAL", 0.01)
+    monkeypatch.setattr(app, "EVENT_PRUNE_EVERY", 1)
+    monkeypatch.setattr(app, "EVENT_RETENTION", 5)
+    bus = app.TableChangeBus()
+    monkeypatch.setattr(app, "change_bus", bus)
+
+    async def scenario():
+        await bus.start()
+        try:
+            # nobody listening: rows are still consumed and pruned
+            for n in range(20):
+                await app.run_db(lambda s: commit_event(s, n))
+            await asyncio.sleep(0.2)
+            left = await app.run_db(lambda s: s.scalar(select(func.count(app.ChangeEventORM.id))))
+            assert left == 5
+
+            # an event committed right after subscribing is delivered
+            with bus.subscribe() as sub:
+                await app.run_db(lambda s: commit_event(s, 99))
+                event = await asyncio.wait_for(sub.get(), 2)
+            assert event == {"type": "resync", "version": 99}
+        finally:
+            await bus.stop()
+
+    # on the app's own loop: in DB_ASYNC mode the pooled connections belong to it
+    client.portal.call(scenario)
+
+
+def test_table_bus_locks_before_drawing_event_ids(client, monkeypatch):
+    # ids must be drawn in commit order (Postgres sequences would not be otherwise)
+    monkeypatch.setattr(app, "change_bus", app.TableChangeBus())
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(app.engine, "before_cursor_execute", record)
+    try:
+        client.portal.call(app.run_db, lambda s: commit_event(s, 1))
+    finally:
+        event.remove(app.engine, "before_cursor_execute", record)
+    assert statements[0].startswith("UPDATE sync_state")
+    assert statements[1].startswith("INSERT INTO change_events")
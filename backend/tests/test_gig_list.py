@@ -0,0 +1,107 @@
+import app
+
+
+def test_cached_list_never_pairs_old_body_with_new_etag(client, monkeypatch):
+    gig_id = client.post("/gigs", json={"title": "Cache Before", "date": "2033-01-10"}).json()["id"]
+    before = client.get("/gigs")
+    assert any(g["title"] == "Cache Before" for g in before.json())
+
+    # a request that lands between a writer's commit and its after_commit bump
+    monkeypatch.setattr(app.data_version, "bump", lambda: 0)
+    assert client.put(f"/gigs/{gig_id}", json={"title": "Cache After"}).status_code == 200
+    during = client.get("/gigs")
+    assert during.headers["ETag"] != before.headers["ETag"]
+    assert any(g["title"] == "Cache After" for g in during.json())
+    assert client.get("/gigs", headers={"If-None-Match": during.headers["ETag"]}).status_code == 304
+
+
+def cursor(client, **params):
+    return client.get("/gigs", params=params).headers["X-Sync-Cursor"]
+
+
+def delta(client, since, **params):
+    r = client.get("/gigs", params={"since": since, **params})
+    assert r.status_code == 200
+    body = r.json()
+    assert body["cursor"] == r.headers["X-Sync-Cursor"]
+    return body
+
+
+def test_since_returns_only_changes_after_the_cursor(client):
+    old_id = client.post("/gigs", json={"title": "Delta Old", "date": "2034-01-05"}).json()["id"]
+    since = cursor(client)
+    assert delta(client, since) == {"cursor": since, "changed": [], "deleted": []}
+
+    new = client.post("/gigs", json={"title": "Delta New", "date": "2034-01-06", "gent_ids": [3]}).json()
+    body = delta(client, since)
+    assert body["changed"] == [new]
+    assert body["deleted"] == []
+    assert int(body["cursor"]) > int(since)
+    assert old_id not in [g["id"] for g in body["changed"]]
+    assert delta(client, body["cursor"])["changed"] == []
+
+
+def test_deleted_gig_is_reported_by_tombstone(client):
+    gig_id = client.post("/gigs", json={"title": "Delta Doomed", "date": "2034-02-01"}).json()["id"]
+    since = cursor(client)
+    assert client.delete(f"/gigs/{gig_id}").status_code == 204
+    body = delta(client, since)
+    assert body["changed"] == []
+    assert body["deleted"] == [gig_id]
+    # a cursor from after the delete no longer sees it
+    assert delta(client, body["cursor"])["deleted"] == []
+
+
+def test_reused_id_drops_its_tombstone(client):
+    gig_id = client.post("/gigs", json={"title": "Delta Reused", "date": "2034-03-01"}).json()["id"]
+    since = cursor(client)
+    assert client.delete(f"/gigs/{gig_id}").status_code == 204
+    # SQLite hands the highest deleted rowid out again
+    reborn = client.post("/gigs", json={"title": "Delta Reborn", "date": "2034-03-02"}).json()
+    assert reborn["id"] == gig_id
+    body = delta(client, since)
+    assert body["changed"] == [reborn]
+    assert body["deleted"] == []
+
+
+def test_gig_leaving_a_gents_view_is_reported_as_deleted(client):
+    gig = client.post("/gigs", json={"title": "Delta Crew", "date": "2034-04-01", "phase": "booked",
+                                     "gent_ids": [1]}).json()
+    since = cursor(client)
+    moved = client.put(f"/gigs/{gig['id']}", json={"gent_ids": [2]}).json()
+    left = delta(client, since, gent_id=1)
+    assert left["changed"] == []
+    assert left["deleted"] == [gig["id"]]
+    assert delta(client, since, gent_id=2)["changed"] == [moved]
+    # planning gigs are public, whoever is on the crew
+    planning = client.put(f"/gigs/{gig['id']}", json={"phase": "planning"}).json()
+    assert delta(client, since, gent_id=1)["changed"] == [planning]
+
+
+def test_since_rejects_bad_cursor_and_unknown_gent(client):
+    assert client.get("/gigs", params={"since": "nope"}).status_code == 400
+    assert client.get("/gigs", params={"since": "0", "gent_id": 9999}).status_code == 404
+    assert client.get("/gigs", params={"since": "0", "limit": 5}).status_code == 400
+
+
+def test_etag_revalidation(client):
+    first = client.get("/gigs")
+    etag = first.headers["ETag"]
+    assert etag == f'W/"{first.headers["X-Sync-Cursor"]}"'
+    unchanged = client.get("/gigs", headers={"If-None-Match": etag})
+    assert unchanged.status_code == 304
+    assert unchanged.content == b""
+    assert unchanged.headers["ETag"] == etag
+
+    client.post("/gigs", json={"title": "Delta Etag", "date": "2034-05-01"})
+    changed = client.get("/gigs", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+    assert any(g["title"] == "Delta Etag" for g in changed.json())
+
+
+def test_unknown_gent_is_404_even_with_a_current_etag(client):
+    etag = client.get("/gigs").headers["ETag"]
+    assert client.get("/gigs", params={"gent_id": 9999}, headers={"If-None-Match": etag}).status_code == 404
+    assert client.get("/gigs", params={"gent_id": 9999}).status_code == 404
+    assert client.get("/gigs", params={"gent_id": 1}, headers={"If-None-Match": etag}).status_code == 304
@@ -0,0 +1,115 @@
+import json
+import logging
+import os
+import subprocess
+import sys
+
+from prometheus_client.parser import text_string_to_metric_families
+
+import app
+from conftest import WORKDIR
+
+
+def parse(text: str) -> dict:
+    """(sample name, labels) -> value."""
+    return {
+        (s.name, tuple(sorted(s.labels.items()))): s.value
+        for family in text_string_to_metric_families(text) for s in family.samples
+    }
+
+
+def scrape(client) -> dict:
+    r = client.get("/metrics")
+    assert r.status_code == 200
+    return parse(r.text)
+
+
+def sample(metrics: dict, name: str, **labels) -> float:
+    return metrics.get((name, tuple(sorted(labels.items()))), 0.0)
+
+
+def test_request_is_recorded_under_its_route_template(client, queries):
+    app.response_cache.clear()
+    before = scrape(client)
+    queries.count = 0
+    assert client.get("/gigs/1/availability").status_code == 200
+    statements = queries.count
+    after = scrape(client)
+
+    route = {"route": "/gigs/{gig_id}/availability"}
+    delta = {
+        name: sample(after, name, **route) - sample(before, name, **route)
+        for name in ("giggle_request_db_queries_count", "giggle_request_db_queries_sum",
+                     "giggle_request_db_rows_count", "giggle_request_db_seconds_count",
+                     "giggle_request_serialize_seconds_count")
+    }
+    assert delta == {
+        "giggle_request_db_queries_count": 1,
+        "giggle_request_db_queries_sum": statements,
+        "giggle_request_db_rows_count": 1,
+        "giggle_request_db_seconds_count": 1,
+        "giggle_request_serialize_seconds_count": 1,
+    }
+    latency = dict(route, method="GET", status="200")
+    assert (sample(after, "giggle_request_duration_seconds_count", **latency)
+            - sample(before, "giggle_request_duration_seconds_count", **latency)) == 1
+    # raw paths never become labels
+    assert not any(dict(labels).get("route") == "/gigs/1/availability" for _, labels in after)
+
+
+class Records(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.messages = []
+
+    def emit(self, record):
+        self.messages.append(record.getMessage())
+
+
+def test_slow_request_log_lists_statements_without_parameters(client, monkeypatch):
+    monkeypatch.setattr(app, "SLOW_REQUEST_MS", 0.001)
+    records = Records()
+    app.slow_log.addHandler(records)
+    try:
+        app.response_cache.clear()
+        assert client.get("/gigs?from=2035-12-31").status_code == 200
+    finally:
+        app.slow_log.removeHandler(records)
+
+    assert len(records.messages) == 1
+    entry = json.loads(records.messages[0])
+    assert entry["route"] == "/gigs"
+    assert entry["path"] == "/gigs"
+    assert entry["status"] == 200
+    assert entry["queries"] == len(entry["statements"]) > 0
+    assert all(set(s) == {"sql", "ms"} for s in entry["statements"])
+    assert any("FROM gigs" in s["sql"] for s in entry["statements"])
+    assert "2035-12-31" not in records.messages[0]
+
+
+SCRIPT = """
+import sys
+sys.path.insert(0, {backend!r})
+from fastapi.testclient import TestClient
+import app
+with TestClient(app.app) as client:
+    if sys.argv[1] == "request":
+        assert client.get("/gents").status_code == 200
+    else:
+        print(client.get("/metrics").text)
+"""
+
+
+def test_multiprocess_metrics_are_aggregated_across_workers():
+    # one worker serves a request, a different one serves the scrape
+    backend = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    prom_dir = os.path.join(WORKDIR, "prometheus")
+    os.makedirs(prom_dir)
+    env = dict(os.environ, PROMETHEUS_MULTIPROC_DIR=prom_dir,
+               DATABASE_URL=f"sqlite:///{os.path.join(WORKDIR, 'multiproc.db')}")
+    script = SCRIPT.format(backend=backend)
+    for _ in range(2):
+        subprocess.run([sys.executable, "-c", script, "request"], env=env, check=True, capture_output=True)
+    scraped = subprocess.run([sys.executable, "-c", script, "scrape"], env=env, check=True,
+                             capture_output=True, text=True).stdout
+    assert sample(parse(scraped), "giggle_request_db_queries_count", route="/gents") == 2
@@ -0,0 +1,60 @@
+"""Statements per route. Assignments are loaded per route with one query
+(load_gent_ids), never lazily per gig, so these stay flat as the data grows;
+writes touch crews with set-based statements, so they stay flat as crews grow."""
+import datetime as dt
+import itertools
+
+import pytest
+
+import app
+
+
+@pytest.mark.parametrize("path, expected", [
+    ("/gents", 1),
+    ("/gigs", 3),                     # version, gigs, gig_gent
+    ("/gigs?gent_id=1", 4),           # + the gent existence check
+    ("/gigs?from=2025-09-01&limit=2", 3),
+    ("/gigs?since=0", 4),             # version, gigs, gig_gent, tombstones
+    ("/gigs/1", 2),
+    ("/gigs/1/availability", 2),
+    ("/availability?from=2025-01-01", 1),
+    ("/reports/gents", 2),
+])
+def test_query_count(client, queries, path, expected):
+    app.response_cache.clear()
+    r = client.get(path)
+    assert r.status_code == 200, r.text
+    assert queries.count == expected
+
+
+def test_cached_gig_list_reads_only_the_version(client, queries):
+    app.response_cache.clear()
+    first = client.get("/gigs")
+    queries.count = 0
+    second = client.get("/gigs")
+    assert second.content == first.content
+    assert queries.count == 1
+
+
+# one day per write case, so assignments never clash with another test's gigs
+DAYS = (dt.date(2037, 1, 1) + dt.timedelta(days=n) for n in itertools.count())
+
+
+@pytest.mark.parametrize("method, path, body, expected", [
+    ("POST", "/gigs", lambda gig, day: {"title": "Counted", "date": day, "gent_ids": [3, 4]}, 9),
+    ("PUT", "/gigs/{gig}", lambda gig, day: {"title": "Recounted", "gent_ids": [2, 3, 4]}, 15),
+    ("PUT", "/gigs/{gig}", lambda gig, day: {"notes": "counted"}, 11),
+    ("PUT", "/gigs/{gig}/availability?actor_role=manager", lambda gig, day: {"gent_id": 3, "status": "assigned"}, 16),
+    ("PUT", "/gigs/{gig}/availability?actor_role=manager", lambda gig, day: {"gent_id": 3, "status": "available"}, 6),
+    ("PUT", "/availability?actor_role=manager",
+     lambda gig, day: [{"gig_id": gig, "gent_id": g, "status": "assigned"} for g in (3, 4)], 16),
+    ("DELETE", "/gigs/{gig}", None, 12),
+], ids=["create", "update-crew", "update-notes", "assign", "reply", "batch-assign", "delete"])
+def test_write_query_count(client, queries, method, path, body, expected):
+    # every case starts from its own booked gig with a crew of [1, 2]
+    day = next(DAYS).isoformat()
+    gig = client.post("/gigs", json={"title": "Counted", "date": day, "phase": "booked", "gent_ids": [1, 2]}).json()["id"]
+    queries.count = 0
+    r = client.request(method, path.format(gig=gig), json=body(gig, day) if body else None)
+    assert r.status_code < 300, r.text
+    assert queries.count == expected
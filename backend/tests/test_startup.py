@@ -0,0 +1,34 @@
+import os
+import threading
+
+from sqlalchemy import create_engine, func, select
+
+import app
+from conftest import WORKDIR
+
+
+def test_concurrent_worker_boots_seed_once():
+    engine = create_engine(f"sqlite:///{os.path.join(WORKDIR, 'boot.db')}")
+    with engine.connect() as conn:
+        app.migrate(conn)
+    barrier = threading.Barrier(4)
+    errors = []
+
+    def boot():
+        barrier.wait()
+        try:
+            with app.SessionLocal(bind=engine) as s:
+                app.seed_once(s)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=boot) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert errors == []
+    with app.SessionLocal(bind=engine) as s:
+        assert s.scalar(select(func.count(app.GentORM.id))) == 4
+        assert s.scalar(select(func.count(app.GigORM.id))) == 3
+    engine.dispose()